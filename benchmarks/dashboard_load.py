@@ -0,0 +1,344 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+ENDPOINTS = ("/", "/healthcheck")
+WORDS = ("amip", "kedi", "koyun", "kapan", "reddit", "bot", "yorum", "gönderi", "çay", "şehir", "ağaç", "güneş")
+LOG_MESSAGES = (
+    "[INFO] Processing a random post from r/{subreddit}...",
+    "[INFO] Query: '{word} OR {word} nsfw:no'",
+    "[WARNING] Submission '{id}' is claimed by another worker, skipping.",
+    "[INFO] Successfully commented on post with ID '{id}'.",
+)
+REPLY_BATCH_SIZE = 50_000
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def random_id(rng: random.Random) -> str:
+    return "".join(rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=7))
+
+
+async def create_schema() -> None:
+    from koyunkapan.bot import database
+
+    await database.init()
+    await database.close()
+
+
+def generate_database(path: str, replies: int, subreddits: int, flairs: int, seed: int) -> None:
+    asyncio.run(create_schema())
+    rng = random.Random(seed)
+
+    with sqlite3.connect(path) as connection:
+        connection.executemany(
+            'INSERT INTO "Subreddit" (id, name) VALUES (?, ?)',
+            [(i + 1, f"subreddit{i}") for i in range(subreddits)],
+        )
+        connection.executemany(
+            'INSERT INTO "Flair" (id, fid, name, subreddit_id) VALUES (?, ?, ?, ?)',
+            [
+                (s * flairs + f + 1, random_id(rng), f"flair{f}", s + 1)
+                for s in range(subreddits)
+                for f in range(flairs)
+            ],
+        )
+        references = [random_id(rng) for _ in range(max(1, replies // 20))]
+
+        for start in range(0, replies, REPLY_BATCH_SIZE):
+            rows = []
+
+            for i in range(start, min(start + REPLY_BATCH_SIZE, replies)):
+                subreddit_id = rng.randint(1, subreddits)
+                rows.append(
+                    (
+                        i + 1,
+                        " ".join(rng.choices(WORDS, k=rng.randint(3, 40))),
+                        random_id(rng),
+                        random_id(rng),
+                        rng.choice(references),
+                        random_id(rng),
+                        f"user{rng.randint(0, 9999)}",
+                        (subreddit_id - 1) * flairs + rng.randint(1, flairs) if flairs else None,
+                        subreddit_id,
+                    )
+                )
+
+            connection.executemany(
+                'INSERT INTO "Reply" (id, text, submission_id, comment_id, reference_submission_id, '
+                "reference_comment_id, reference_author, flair_id, subreddit_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.commit()
+
+
+def generate_log(path: str, size_mb: int, seed: int) -> None:
+    rng = random.Random(seed)
+    lines = []
+
+    while sum(len(line) for line in lines) < 1024 * 1024:
+        message = rng.choice(LOG_MESSAGES).format(
+            subreddit=f"subreddit{rng.randint(0, 29)}", word=rng.choice(WORDS), id=random_id(rng)
+        )
+        lines.append(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}\n")
+
+    block = "".join(lines).encode("utf-8")
+
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def peak_rss_mb(pid: int) -> float | None:
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        return None
+
+    return None
+
+
+def drive(get, requests: int, concurrency: int, cold: bool) -> dict:
+    results = {}
+
+    for endpoint in ENDPOINTS:
+
+        def _request(i: int) -> float:
+            path = f"{endpoint}?n={i}" if cold else endpoint
+            started = time.perf_counter()
+            status = get(path)
+            elapsed = (time.perf_counter() - started) * 1000
+
+            if status != 200:
+                raise RuntimeError(f"GET {path} returned {status}")
+
+            return elapsed
+
+        get(endpoint)
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(concurrency) as executor:
+            latencies = list(executor.map(_request, range(requests)))
+
+        wall = time.perf_counter() - started
+        results[endpoint] = {
+            "p50_ms": statistics.median(latencies),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "requests_per_second": requests / wall,
+        }
+
+    return results
+
+
+def run_client(args: argparse.Namespace) -> dict:
+    from koyunkapan.dashboard.main import create_app
+
+    app = create_app()
+
+    def _get(path: str) -> int:
+        return app.test_client().get(path).status_code
+
+    try:
+        results = drive(_get, args.requests, args.concurrency, args.cold)
+    finally:
+        app.stop()
+
+    results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return results
+
+
+def run_server(args: argparse.Namespace) -> dict:
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "koyunkapan.dashboard.asgi:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=os.environ.copy(),
+    )
+
+    def _get(path: str) -> int:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=600) as response:
+            response.read()
+            return response.status
+
+    try:
+        for _ in range(300):
+            try:
+                _get("/healthcheck")
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        results = drive(_get, args.requests, args.concurrency, args.cold)
+        results["peak_rss_mb"] = peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return results
+
+
+def setup_scale(args: argparse.Namespace) -> None:
+    data_dir = os.environ["KOYUNKAPAN_DATA_DIR"]
+    started = time.perf_counter()
+
+    if not os.path.exists(os.path.join(data_dir, "app.db")):
+        generate_database(os.path.join(data_dir, "app.db"), args.setup_scale, args.subreddits, args.flairs, args.seed)
+
+    if args.archive:
+        from koyunkapan.bot import database, retention
+
+        async def _archive() -> None:
+            await database.init()
+            await retention.archive_replies()
+            await database.close()
+
+        asyncio.run(_archive())
+
+    print(json.dumps({"setup_seconds": time.perf_counter() - started}))
+
+
+def run_scale(args: argparse.Namespace) -> None:
+    results = run_server(args) if args.mode == "server" else run_client(args)
+    print(json.dumps(results))
+
+
+def run_child(flag: str, replies: int, forwarded: list[str], env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, __file__, flag, str(replies), *forwarded],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Run with {replies} replies failed.")
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the dashboard against a synthetic database.")
+    parser.add_argument("--replies", type=int, action="append", help="reply counts to test (default: 10k, 100k, 1M)")
+    parser.add_argument("--subreddits", type=int, default=30)
+    parser.add_argument("--flairs", type=int, default=5, help="flairs per subreddit")
+    parser.add_argument("--log-mb", type=int, default=2048, help="size of the synthetic app.log in MiB")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mode", choices=("client", "server"), default="client")
+    parser.add_argument("--cold", action="store_true", help="bypass the dashboard response cache")
+    parser.add_argument("--archive", action="store_true", help="archive old reply text before the run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workdir", help="directory for the generated data (reused between runs)")
+    parser.add_argument("--output", help="JSON file to append results to (default: <workdir>/dashboard_load.json)")
+    parser.add_argument("--setup-scale", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--run-scale", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.setup_scale is not None:
+        setup_scale(args)
+        return
+
+    if args.run_scale is not None:
+        run_scale(args)
+        return
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="koyunkapan-load-"))
+    log_file = os.path.join(workdir, "app.log")
+    os.makedirs(workdir, exist_ok=True)
+
+    if not os.path.exists(log_file) or os.path.getsize(log_file) < args.log_mb * 1024 * 1024:
+        print(f"Generating a {args.log_mb} MiB log file...")
+        generate_log(log_file, args.log_mb, args.seed)
+
+    report = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "mode": args.mode,
+        "cold": args.cold,
+        "archive": args.archive,
+        "log_mb": args.log_mb,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "scales": {},
+    }
+    forwarded = [
+        *("--subreddits", str(args.subreddits), "--flairs", str(args.flairs), "--seed", str(args.seed)),
+        *("--requests", str(args.requests), "--concurrency", str(args.concurrency), "--mode", args.mode),
+        *(["--cold"] if args.cold else []),
+        *(["--archive"] if args.archive else []),
+    ]
+
+    for replies in args.replies or [10_000, 100_000, 1_000_000]:
+        data_dir = os.path.join(workdir, f"replies-{replies}")
+        os.makedirs(data_dir, exist_ok=True)
+
+        if not os.path.exists(os.path.join(data_dir, "app.log")):
+            os.symlink(log_file, os.path.join(data_dir, "app.log"))
+
+        env = dict(os.environ, KOYUNKAPAN_DATA_DIR=data_dir)
+        env.pop("KOYUNKAPAN_DB_URL", None)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+        print(f"Preparing {replies} replies...")
+        setup = run_child("--setup-scale", replies, forwarded, env)
+        print(f"Running {replies} replies...")
+        scale = run_child("--run-scale", replies, forwarded, env)
+        scale.update(setup)
+        report["scales"][str(replies)] = scale
+
+        for endpoint in ENDPOINTS:
+            stats = scale[endpoint]
+            print(
+                f"{replies:>9} {endpoint:<13} p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  "
+                f"p99 {stats['p99_ms']:8.1f} ms  {stats['requests_per_second']:7.1f} req/s"
+            )
+
+        peak_rss = scale["peak_rss_mb"]
+        print(f"{replies:>9} peak RSS {peak_rss:.1f} MiB" if peak_rss is not None else f"{replies:>9} peak RSS n/a")
+
+    output = args.output or os.path.join(workdir, "dashboard_load.json")
+
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report) + "\n")
+
+    print(f"Results appended to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+
+TARGETS = {
+    "bot": "koyunkapan.bot.core",
+    "dashboard": "koyunkapan.dashboard.main",
+    "dashboard-asgi": "koyunkapan.dashboard.asgi",
+}
+HEAVY_MODULES = ("numpy", "asyncpraw", "asyncprawcore", "tortoise", "aiohttp")
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    cumulative = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        cumulative[module.strip()] = int(cumulative_us)
+
+    return cumulative
+
+
+def measure(module: str, env: dict[str, str]) -> dict:
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    cumulative = parse_importtime(result.stderr)
+    slowest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)
+
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": cumulative.get(module, 0) / 1000,
+        "heavy_modules": [name for name in result.stdout.strip().split(",") if name],
+        "slowest": [(name, us / 1000) for name, us in slowest if not name.startswith(module)][:10],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of koyunkapan entry points.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", choices=TARGETS, action="append")
+    parser.add_argument(
+        "--output", help="JSON file to append results to (default: $KOYUNKAPAN_DATA_DIR/importtime.json)"
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.setdefault("KOYUNKAPAN_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "data"))
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.path.join(os.path.dirname(__file__), "..", "src"), env.get("PYTHONPATH")])
+    )
+
+    report = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "targets": {},
+    }
+
+    for name in args.target or list(TARGETS):
+        runs = [measure(TARGETS[name], env) for _ in range(args.runs)]
+        report["targets"][name] = {
+            "module": TARGETS[name],
+            "wall_ms_median": statistics.median(run["wall_ms"] for run in runs),
+            "import_ms_median": statistics.median(run["import_ms"] for run in runs),
+            "heavy_modules": runs[-1]["heavy_modules"],
+            "slowest": runs[-1]["slowest"],
+        }
+
+        target = report["targets"][name]
+        print(
+            f"{name:<16} import {target['import_ms_median']:8.1f} ms  "
+            f"process {target['wall_ms_median']:8.1f} ms  heavy: {', '.join(target['heavy_modules']) or '-'}"
+        )
+
+    output = args.output or os.path.join(env["KOYUNKAPAN_DATA_DIR"], "importtime.json")
+
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report) + "\n")
+
+    print(f"Results appended to {output}")
+
+
+if __name__ == "__main__":
+    main()
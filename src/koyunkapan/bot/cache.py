@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterable
+
+import asyncpraw
+from asyncpraw.models import Comment, MoreComments, Submission
+
+from . import configs, metrics, retry
+
+
+class SingleFlight:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self.results.get(key)
+
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+
+        if time.monotonic() - stored_at > self.ttl:
+            self.results.pop(key)
+            return None
+
+        self.results.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.results[key] = (time.monotonic(), value)
+        self.results.move_to_end(key)
+
+        while len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+
+        if value is not None:
+            metrics.increment("cache_hits")
+            return value
+
+        while key in self.in_flight:
+            metrics.increment("coalesced_loads")
+            owner = self.in_flight[key]
+
+            try:
+                return await asyncio.shield(owner)
+            except asyncio.CancelledError:
+                if not owner.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+
+        try:
+            value = await factory()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()
+            raise
+        finally:
+            self.in_flight.pop(key, None)
+
+        self.put(key, value)
+        future.set_result(value)
+        return value
+
+
+class Loader:
+    def __init__(self, reddit: asyncpraw.Reddit) -> None:
+        self.reddit = reddit
+        self.flight = SingleFlight(configs.LOAD_CACHE_SIZE, configs.LOAD_CACHE_TTL)
+
+    async def submission(self, submission_id: str, comment_sort: str = "best") -> Submission:
+        async def _load() -> Submission:
+            submission = await self.reddit.submission(id=submission_id, fetch=False)
+            submission.comment_sort = comment_sort
+            await retry.call(submission.load, retry.READ, "load")
+            return submission
+
+        return await self.flight.do(("submission", submission_id, comment_sort), _load)
+
+    async def comment(self, comment: Comment | str) -> Comment:
+        if isinstance(comment, str):
+            comment = await self.reddit.comment(comment, fetch=False)
+
+        async def _load() -> Comment:
+            await retry.call(comment.load, retry.READ, "load")
+            return comment
+
+        return await self.flight.do(("comment", comment.id), _load)
+
+    async def iter_comments(
+        self,
+        forest: Iterable[Comment | MoreComments],
+        limit: int | None = None,
+        depth: int = 0,
+        expand_more: bool = False,
+    ) -> AsyncIterator[Comment]:
+        pending = deque([(iter(forest), 0)])
+        yielded = 0
+
+        while pending:
+            comments, level = pending.popleft()
+
+            for comment in comments:
+                if isinstance(comment, MoreComments):
+                    if expand_more:
+                        expanded = await retry.call(comment.comments, retry.READ, "load")
+                        pending.appendleft((iter(expanded), level))
+                    continue
+
+                yield comment
+                yielded += 1
+
+                if limit is not None and yielded >= limit:
+                    return
+
+                if level < depth:
+                    pending.append((iter(comment.replies), level + 1))
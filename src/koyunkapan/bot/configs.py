@@ -1,8 +1,11 @@
 import os
 
-DATA_DIR = os.environ.get("KOYUNKAPAN_DATA_DIR")
-LOG_FILE = os.path.join(DATA_DIR, "app.log")
-DB_FILE = os.path.join(DATA_DIR, "app.db")
+LOG_FORMAT = os.environ.get("KOYUNKAPAN_LOG_FORMAT", "text")
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_ROTATE_INTERVAL = 24 * 60 * 60
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 1.0
 
 MIN_SLEEP_MINUTES = 5
 MAX_SLEEP_MINUTES = 15
@@ -14,10 +17,53 @@ SEARCH_LIMIT = 10
 MAX_KEYWORDS = 25
 RANDOM_POST_COUNT = 10
 TOP_COMMENT_LIMIT = 10
+SOURCE_COMMENT_LIMIT = 200
+SOURCE_COMMENT_DEPTH = 2
 SIMILARITY_THRESHOLD = 1.35
 MIN_SUBMISSION_THRESHOLD = 20
 TIER_2_SUBREDDIT_COUNT = 5
 
+PLANNER_KEYWORD_LIMIT = 5
+PLANNER_MAX_QUERIES = 6
+PLANNER_SEARCH_POPULATION = 1000
+PLANNER_MIN_EXPECTED_HITS = 1
+PLANNER_CORPUS_SIZE = 5000
+PLANNER_CORPUS_TTL = 60 * 60
+
+SCHEDULER_HISTORY_SIZE = 1000
+SCHEDULER_PRIOR_API_CALLS = 20
+SCHEDULER_FRESH_POSTS = 3
+
+HARVESTER_TTL = 30 * 60
+HARVESTER_INTERVAL = 2
+HARVESTER_POOL_SIZE = 500
+HARVESTER_RESERVED_REQUESTS = 300
+
+SUBREDDIT_LEASE_TTL = 30 * 60
+SUBMISSION_LEASE_TTL = 60 * 60
+INBOX_LEASE_TTL = 5 * 60
+MENTION_LEASE_TTL = 30 * 60
+
+LOAD_CACHE_SIZE = 256
+LOAD_CACHE_TTL = 5 * 60
+
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 2 * 60
+
+PERSIST_BATCH_SIZE = 50
+PERSIST_FLUSH_INTERVAL = 30
+
+SHADOW_SLEEP = 1
+
+RETENTION_HOT_REPLIES = PLANNER_CORPUS_SIZE
+RETENTION_BATCH_SIZE = 500
+RETENTION_INTERVAL = 6 * 60 * 60
+RETENTION_COMPRESSION_LEVEL = 6
+
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_LAG_INTERVAL = 0.05
+PROFILE_TOP_FUNCTIONS = 20
+
 SUBREDDIT_WEIGHTS = {
     "amip": 1.0,
     "KGBTR": 2.0,
@@ -45,3 +91,24 @@ SUBREDDIT_WEIGHTS = {
 
 FORBIDDEN_FLAIR = "Ciddi"
 FORBIDDEN_COMMENTS = ("[removed]", "[deleted]", "", " ", None)
+
+
+def __getattr__(name: str) -> str:
+    if name == "DATA_DIR":
+        data_dir = os.environ.get("KOYUNKAPAN_DATA_DIR")
+
+        if not data_dir:
+            raise RuntimeError("KOYUNKAPAN_DATA_DIR environment variable is not set.")
+
+        return data_dir
+
+    if name == "LOG_FILE":
+        return os.path.join(__getattr__("DATA_DIR"), "app.log")
+
+    if name == "DB_FILE":
+        return os.path.join(__getattr__("DATA_DIR"), "app.db")
+
+    if name == "DB_URL":
+        return os.environ.get("KOYUNKAPAN_DB_URL") or f"sqlite://{__getattr__('DB_FILE')}"
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
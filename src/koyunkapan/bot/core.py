@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import configparser
 import os
@@ -5,14 +6,21 @@ import random
 import re
 import time
 import warnings
+from contextlib import contextmanager
 
 import asyncpraw
 from asyncpraw.exceptions import APIException
 from asyncpraw.models import Comment, Message, Submission
 from asyncprawcore.exceptions import RequestException, ServerError, TooManyRequests
 
-from . import configs, database, models, utils
+from . import configs, database, metrics, models, planner, retention, retry, utils
+from .cache import Loader
+from .harvester import CandidatePool, Harvester
+from .leases import LeaseManager, ShadowLeaseManager
 from .logger import Logger
+from .persistence import WriteBehind
+from .profiling import Profiler
+from .scheduler import Scheduler
 from .utils import handle_api_exceptions
 
 log = Logger()
@@ -20,25 +28,70 @@ warnings.filterwarnings("ignore")
 
 
 class Bot:
-    def __init__(self, reddit_instance: asyncpraw.Reddit) -> None:
+    def __init__(
+        self,
+        reddit_instance: asyncpraw.Reddit,
+        leases: LeaseManager,
+        writer: WriteBehind,
+        account: str = "bot",
+        shadow: bool = False,
+    ) -> None:
         self.reddit = reddit_instance
+        self.leases = leases
+        self.writer = writer
+        self.account = account
+        self.shadow = shadow
+        self.seen_mentions = set()
+        self.shadow_replies = 0
+        self.shadow_submissions = set()
+        self.started_at = time.monotonic()
         self.keywords = []
         self.subreddit_names = []
+        self.submissions = []
+        self.velocity = 0.0
+        self.corpus = None
+        self.corpus_loaded_at = 0.0
+        self.pool = CandidatePool()
+        self.loader = Loader(reddit_instance)
+        self.active = 0
+
+    @contextmanager
+    def busy(self):
+        self.active += 1
+
+        try:
+            yield
+        finally:
+            self.active -= 1
 
-    async def setup(self) -> None:
-        subreddits = list(configs.SUBREDDIT_WEIGHTS.keys())
-        weights = list(configs.SUBREDDIT_WEIGHTS.values())
-        subreddit_name = random.choices(subreddits, weights=weights, k=1)[0]
+    async def load_submission(self, submission: Submission) -> Submission:
+        warm_submission = self.pool.get(submission.id)
+
+        if warm_submission is not None:
+            return warm_submission
+
+        return await self.loader.submission(submission.id)
+
+    async def setup(self, subreddit_name: str) -> None:
+        self.submissions = []
+        self.velocity = 0.0
         self.subreddit = await self.reddit.subreddit(subreddit_name)
         self.subreddit_obj, created = await models.Subreddit.get_or_create(name=subreddit_name)
         self.flairs = await models.Flair.filter(subreddit=self.subreddit_obj).values_list("fid", flat=True)
         self.replies = await models.Reply.filter(subreddit=self.subreddit_obj).values_list("submission_id", flat=True)
+
+        if self.shadow:
+            shadow_ids = await models.ShadowReply.filter(subreddit=self.subreddit_obj, kind="post").values_list(
+                "submission_id", flat=True
+            )
+            self.replies = [*self.replies, *shadow_ids, *self.shadow_submissions]
+
         self.subreddit_names = await models.Subreddit.all().values_list("name", flat=True)
 
         if not self.flairs:
             await self.init_flair_replies()
 
-    @handle_api_exceptions()
+    @handle_api_exceptions(retry.READ, "flair")
     async def init_flair_replies(self) -> None:
         new_flairs = []
         existing_flair_fids = await models.Flair.filter(subreddit=self.subreddit_obj).values_list("fid", flat=True)
@@ -56,7 +109,7 @@ class Bot:
 
         if new_flairs:
             await models.Flair.bulk_create(new_flairs)
-            log.info(f"Added {len(new_flairs)} new flairs to the database.")
+            log.info("Added %s new flairs to the database.", len(new_flairs))
 
     @handle_api_exceptions()
     async def fetch_new_submissions(self) -> None:
@@ -66,16 +119,42 @@ class Bot:
         def _is_valid(submission):
             return submission.id not in self.replies and submission.link_flair_text != configs.FORBIDDEN_FLAIR
 
+        def _velocity(created):
+            if len(created) > 1 and max(created) > min(created):
+                return (len(created) - 1) / (max(created) - min(created)) * 3600
+
+            return 0.0
+
         async def _collect(generator):
+            created = []
+
             async for submission in generator:
+                created.append(submission.created_utc)
+
                 if submission.id not in seen_ids and _is_valid(submission):
                     self.submissions.append(submission)
                     seen_ids.add(submission.id)
 
-        await _collect(self.subreddit.new(limit=configs.POST_LIMIT))
-        await _collect(self.subreddit.hot(limit=configs.POST_LIMIT))
+            return created
 
-        log.info(f"{len(self.submissions)} potential submission collected.")
+        warm_submissions = self.pool.for_subreddit(self.subreddit.display_name)
+
+        if len(warm_submissions) >= configs.POST_LIMIT:
+            for submission in warm_submissions:
+                if submission.id not in seen_ids and _is_valid(submission):
+                    self.submissions.append(submission)
+                    seen_ids.add(submission.id)
+
+            newest = sorted((submission.created_utc for submission in warm_submissions), reverse=True)
+            self.velocity = _velocity(newest[: configs.POST_LIMIT])
+            log.info("%s potential submission collected from the warm pool.", len(self.submissions))
+            return
+
+        created = await retry.call(lambda: _collect(self.subreddit.new(limit=configs.POST_LIMIT)), endpoint="listing")
+        await retry.call(lambda: _collect(self.subreddit.hot(limit=configs.POST_LIMIT)), endpoint="listing")
+
+        self.velocity = _velocity(created)
+        log.info("%s potential submission collected.", len(self.submissions))
 
     @handle_api_exceptions()
     async def select_random_submission(self) -> Submission | None:
@@ -83,8 +162,7 @@ class Bot:
             if not self.submissions:
                 return None
 
-            submission = random.choice(self.submissions)
-            await submission.load()
+            submission = await self.load_submission(random.choice(self.submissions))
 
             if submission.num_comments >= configs.RANDOM_POST_COUNT:
                 return submission
@@ -94,14 +172,12 @@ class Bot:
     @handle_api_exceptions()
     async def extract_keywords_from_submission(self, submission: Submission) -> None:
         self.keywords = []
-        submission.comment_sort = "best"
+        submission = await self.load_submission(submission)
 
         for word in submission.title.split():
             self.keywords.append(word.lower())
 
-        await submission.load()
-
-        for top_level_comment in submission.comments.list()[: configs.TOP_COMMENT_LIMIT]:
+        async for top_level_comment in self.loader.iter_comments(submission.comments, configs.TOP_COMMENT_LIMIT):
             if (
                 top_level_comment.body
                 and top_level_comment.body.strip()
@@ -116,14 +192,15 @@ class Bot:
 
     @handle_api_exceptions()
     async def find_similar_submissions(self, title: str, is_nsfw: bool) -> list[Submission] | None:
-        results = []
         query = f"{(' OR ').join(title.split())} nsfw:{'yes' if is_nsfw else 'no'}"
-        log.info(f"Query: '{query}'")
+        log.info("Query: '%s'", query)
+        return await self._search(self.subreddit, query, configs.SEARCH_LIMIT)
 
-        async for post in self.subreddit.search(query, limit=configs.SEARCH_LIMIT):
-            results.append(post)
+    async def _search(self, subreddit: asyncpraw.models.Subreddit, query: str, limit: int) -> list[Submission]:
+        async def _collect():
+            return [submission async for submission in subreddit.search(query, limit=limit)]
 
-        return results
+        return await retry.call(_collect, retry.SEARCH, "search")
 
     async def collect_comments_from_submissions(
         self, submissions: list[Submission], original_submission: Submission
@@ -134,23 +211,21 @@ class Bot:
             if submission.id == original_submission.id:
                 continue
 
-            submission.comment_sort = "best"
-
-            loaded_submission = await utils.robust_praw_call(submission.load())
-            if not loaded_submission:
+            submission = await utils.robust_praw_call(lambda: self.load_submission(submission))
+            if not submission:
                 continue
 
-            for top_level_comment in submission.comments.list()[: configs.TOP_COMMENT_LIMIT]:
+            async for top_level_comment in self.loader.iter_comments(submission.comments, configs.TOP_COMMENT_LIMIT):
                 try:
                     comment_text = top_level_comment.body.splitlines()[0].lower()
 
                     if comment_text not in configs.FORBIDDEN_COMMENTS and len(comment_text) > 0:
                         comments.append(top_level_comment)
                 except IndexError:
-                    log.warning(f"Comment '{top_level_comment.id}' has an empty body, skipping.")
+                    log.warning("Comment '%s' has an empty body, skipping.", top_level_comment.id)
                     continue
 
-        log.info(f"'{len(comments)}' similar comments collected.")
+        log.info("'%s' similar comments collected.", len(comments))
         return comments
 
     def find_best_comments(self, comments: list[Comment], keywords: list[str]) -> list[Comment]:
@@ -180,59 +255,69 @@ class Bot:
         return []
 
     @handle_api_exceptions()
-    async def submission_comment(self, submission: Submission, comments: list[Comment]) -> None:
+    async def submission_comment(self, submission: Submission, comments: list[Comment]) -> bool:
         if not comments:
-            log.warning(f"No suitable comments found for submission '{submission.id}'.")
-            return
+            log.warning("No suitable comments found for submission '%s'.", submission.id)
+            return False
 
         best_comment = None
 
         for comment in comments:
             try:
                 comment_text = comment.body.splitlines()[0].lower()
-                is_used = await models.Reply.filter(reference_comment_id=comment.id).exists()
-
-                if not is_used:
-                    best_comment = comment
-                    break
             except IndexError:
-                log.warning(f"Comment '{comment.id}' has an empty body, skipping.")
+                log.warning("Comment '%s' has an empty body, skipping.", comment.id)
                 continue
 
-        if not best_comment:
-            log.warning(f"All suitable comments for submission '{submission.id}' have already been used.")
-            return
+            if not comment_text.strip():
+                continue
 
-        comment_text = best_comment.body.splitlines()[0].lower()
+            if await self.leases.reserve_comment(comment.id):
+                best_comment = comment
+                break
 
-        if not comment_text.strip():
-            log.warning(f"Comment text for submission '{submission.id}' is empty or whitespace, skipping.")
-            return
+        if not best_comment:
+            log.warning("All suitable comments for submission '%s' have already been used.", submission.id)
+            return False
 
-        bot_comment = await submission.reply(comment_text)
+        if self.shadow:
+            await self.record_shadow_reply(
+                "post", submission.id, comment_text, best_comment, self.subreddit_obj.name, candidates=len(comments)
+            )
+            self.replies.append(submission.id)
+            self.shadow_submissions.add(submission.id)
+            return True
 
         try:
-            flair = await models.Flair.get(fid=submission.link_flair_template_id, subreddit=self.subreddit_obj)
+            bot_comment = await retry.call(lambda: submission.reply(comment_text), retry.WRITE, "reply")
         except Exception:
-            flair = None
-
-        await models.Reply.create(
-            text=comment_text,
-            submission_id=submission.id,
-            comment_id=bot_comment.id,
-            reference_submission_id=best_comment.submission.id,
-            reference_comment_id=best_comment.id,
-            reference_author=str(best_comment.author),
-            flair=flair,
-            subreddit=self.subreddit_obj,
+            await self.leases.release_comment(best_comment.id)
+            raise
+
+        await self.writer.add(
+            "Reply",
+            [
+                {
+                    "text": comment_text,
+                    "submission_id": submission.id,
+                    "comment_id": bot_comment.id,
+                    "reference_submission_id": best_comment.submission.id,
+                    "reference_comment_id": best_comment.id,
+                    "reference_author": str(best_comment.author),
+                    "flair": getattr(submission, "link_flair_template_id", None),
+                    "subreddit": self.subreddit_obj.name,
+                }
+            ],
         )
+        self.replies.append(submission.id)
 
-        log.info(f"Successfully commented on post with ID '{submission.id}'.")
+        log.info("Successfully commented on post with ID '%s'.", submission.id)
+        return True
 
     @handle_api_exceptions()
-    async def process_post(self, submission_id: str | None = None) -> None:
+    async def process_post(self, submission_id: str | None = None) -> bool:
         if submission_id:
-            submission = await self.reddit.submission(id=submission_id)
+            submission = await self.loader.submission(submission_id)
         else:
             await self.fetch_new_submissions()
             submission = await self.select_random_submission()
@@ -241,9 +326,13 @@ class Bot:
 
         if not submission:
             log.warning("No suitable submission found for processing.")
-            return
+            return False
+
+        if not await self.leases.acquire(f"submission:{submission.id}", configs.SUBMISSION_LEASE_TTL):
+            log.info("Submission '%s' is claimed by another worker, skipping.", submission.id)
+            return False
 
-        log.info(f"--- Process Started: '{submission.id}' ---")
+        log.info("--- Process Started: '%s' ---", submission.id)
         await self.extract_keywords_from_submission(submission)
         log.info("Searching for similar submissions...")
         similar_submissions = await self.find_similar_submissions(submission.title, submission.over_18)
@@ -254,11 +343,17 @@ class Bot:
         else:
             best_comments = self.find_best_comments([], self.keywords)
 
-        await self.submission_comment(submission, best_comments)
+        success = await self.submission_comment(submission, best_comments)
         log.info("--- Process Completed ---")
+        return success
 
     async def select_random_comment(self, submission: Submission) -> Comment | None:
-        comments = submission.comments.list()
+        comments = [
+            comment
+            async for comment in self.loader.iter_comments(
+                submission.comments, configs.SOURCE_COMMENT_LIMIT, configs.SOURCE_COMMENT_DEPTH
+            )
+        ]
 
         if not comments:
             return None
@@ -278,12 +373,15 @@ class Bot:
 
         async def search_in_subreddit(subreddit_name):
             subreddit = await self.reddit.subreddit(subreddit_name)
-
-            async for submission in subreddit.search(query, limit=configs.POST_LIMIT):
-                submissions.append(submission)
+            submissions.extend(await self._search(subreddit, query, configs.POST_LIMIT))
 
         search_pool = [name for name in self.subreddit_names if name not in exclude]
-        await asyncio.gather(*(search_in_subreddit(name) for name in search_pool))
+        results = await asyncio.gather(*(search_in_subreddit(name) for name in search_pool), return_exceptions=True)
+
+        for subreddit_name, result in zip(search_pool, results):
+            if isinstance(result, Exception):
+                log.warning("Error searching in '%s': %s", subreddit_name, result)
+
         return submissions
 
     async def _collect_source_comments(
@@ -296,24 +394,20 @@ class Bot:
             if limit_reached:
                 break
 
-            loaded_submission = await utils.robust_praw_call(submission.load())
-            if not loaded_submission:
-                continue
-
-            replace_more_result = await utils.robust_praw_call(submission.comments.replace_more(limit=0))
-            if not replace_more_result:
+            submission = await utils.robust_praw_call(lambda: self.load_submission(submission))
+            if not submission:
                 continue
 
-            for comment in submission.comments.list():
-                if limit_reached:
-                    break
-
+            async for comment in self.loader.iter_comments(
+                submission.comments, configs.SOURCE_COMMENT_LIMIT, configs.SOURCE_COMMENT_DEPTH
+            ):
                 if comment.id not in processed_comment_ids and comment.body not in configs.FORBIDDEN_COMMENTS:
                     all_potential_source_comments.append(comment)
                     processed_comment_ids.add(comment.id)
 
-                    if len(all_potential_source_comments) > 200:
+                    if len(all_potential_source_comments) > configs.SOURCE_COMMENT_LIMIT:
                         limit_reached = True
+                        break
         return all_potential_source_comments
 
     async def _collect_replies(self, source_comments: list[Comment]) -> list[Comment]:
@@ -323,11 +417,11 @@ class Bot:
             if i > 0 and i % 20 == 0:
                 await asyncio.sleep(10)
 
-            loaded_comment = await utils.robust_praw_call(source_comment.load())
-            if not loaded_comment:
+            source_comment = await utils.robust_praw_call(lambda: self.loader.comment(source_comment))
+            if not source_comment:
                 continue
 
-            for reply in source_comment.replies:
+            async for reply in self.loader.iter_comments(source_comment.replies):
                 if reply.body and reply.body.strip() and reply.body not in configs.FORBIDDEN_COMMENTS:
                     all_replies.append(reply)
         return all_replies
@@ -337,8 +431,7 @@ class Bot:
             return None
 
         for comment in comments:
-            is_used = await models.Reply.filter(reference_comment_id=comment.id).exists()
-            if not is_used:
+            if await self.leases.reserve_comment(comment.id):
                 return comment
         return None
 
@@ -358,7 +451,7 @@ class Bot:
 
     async def _find_best_comment_with_fallbacks(
         self, submissions: list[Submission], keywords: list[str], original_comment: Comment
-    ) -> Comment | None:
+    ) -> tuple[Comment | None, bool]:
         all_potential_source_comments = []
         processed_comment_ids = {original_comment.id}
 
@@ -367,65 +460,76 @@ class Bot:
             if source_comments:
                 all_potential_source_comments.extend(source_comments)
 
-        log.info(f"Collected {len(all_potential_source_comments)} potential source comments.")
+        log.info("Collected %s potential source comments.", len(all_potential_source_comments))
 
         if not all_potential_source_comments:
             log.warning("No potential source comments found.")
-            return None
+            return None, False
 
         best_comments = self.find_best_comments(all_potential_source_comments, keywords)
         best_comment = await self._find_first_unused_comment(best_comments)
 
-        if not best_comment and best_comments:
+        if best_comment:
+            return best_comment, True
+
+        if best_comments:
             log.warning("All suitable comments have been used. Picking a random one.")
-            best_comment = random.choice(best_comments)
+            return random.choice(best_comments), False
 
-        if not best_comment:
-            log.warning(
-                "No suitable reply found in any search results. Falling back to random comment from original submission."
-            )
-            try:
-                original_submission = await self.reddit.submission(id=original_comment.submission.id)
-                await original_submission.load()
-                comments = original_submission.comments.list()
-
-                valid_comments = [
-                    c
-                    for c in comments
-                    if c.author
-                    and c.author.name != self.reddit.user.me()
-                    and c.body not in configs.FORBIDDEN_COMMENTS
-                    and c.id != original_comment.id
-                ]
-
-                if valid_comments:
-                    best_comment = random.choice(valid_comments)
-                    log.info(f"Fallback successful. Picked random comment {best_comment.id}")
-                else:
-                    log.warning("Fallback failed: No valid random comments found in original submission.")
-                    return None
+        log.warning(
+            "No suitable reply found in any search results. Falling back to random comment from original submission."
+        )
+        try:
+            original_submission = await self.load_submission(original_comment.submission)
+            valid_comments = [
+                c
+                async for c in self.loader.iter_comments(
+                    original_submission.comments, configs.SOURCE_COMMENT_LIMIT, configs.SOURCE_COMMENT_DEPTH
+                )
+                if c.author
+                and c.author.name != self.reddit.user.me()
+                and c.body not in configs.FORBIDDEN_COMMENTS
+                and c.id != original_comment.id
+            ]
 
-            except Exception as e:
-                log.error(f"Error during fallback to random comment: {e}")
-                return None
-        return best_comment
+            if valid_comments:
+                best_comment = random.choice(valid_comments)
+                log.info("Fallback successful. Picked random comment %s", best_comment.id)
+            else:
+                log.warning("Fallback failed: No valid random comments found in original submission.")
+                return None, False
+
+        except Exception as e:
+            log.error("Error during fallback to random comment: %s", e)
+            return None, False
+
+        return best_comment, False
 
     async def _perform_tiered_search(
-        self, search_queries: list[str], original_subreddit: asyncpraw.models.Subreddit
+        self,
+        search_queries: list[str],
+        original_subreddit: asyncpraw.models.Subreddit,
+        warm_submissions: list[Submission] | None = None,
     ) -> list[Submission]:
-        submissions = []
+        submissions = list(warm_submissions or [])
         searched_subreddits = []
 
+        if len(submissions) >= configs.MIN_SUBMISSION_THRESHOLD:
+            log.info("Found %s warm submissions, skipping search.", len(submissions))
+            return submissions
+
         try:
-            log.info(f"Tier 1: Searching in original subreddit '{original_subreddit.display_name}'.")
+            log.info("Tier 1: Searching in original subreddit '%s'.", original_subreddit.display_name)
             for query in search_queries:
-                async for submission in original_subreddit.search(query, limit=configs.POST_LIMIT):
-                    submissions.append(submission)
+                submissions.extend(await self._search(original_subreddit, query, configs.POST_LIMIT))
                 if len(submissions) > configs.MIN_SUBMISSION_THRESHOLD:
                     break
             searched_subreddits.append(original_subreddit.display_name)
+        except retry.CircuitOpenError as e:
+            log.warning("%s Returning %s submissions found so far.", e, len(submissions))
+            return submissions
         except (APIException, RequestException, ServerError) as e:
-            log.warning(f"Error searching in '{original_subreddit.display_name}': {e}")
+            log.warning("Error searching in '%s': %s", original_subreddit.display_name, e)
 
         if len(submissions) < configs.MIN_SUBMISSION_THRESHOLD:
             subreddits_pool = [sub for sub in self.subreddit_names if sub not in searched_subreddits]
@@ -438,19 +542,21 @@ class Bot:
                     k=min(configs.TIER_2_SUBREDDIT_COUNT, len(subreddits_pool)),
                 )
                 log.info(
-                    f"Tier 2: Not enough results, expanding search to {len(tier_2_subs)} subreddits: {tier_2_subs}"
+                    "Tier 2: Not enough results, expanding search to %s subreddits: %s", len(tier_2_subs), tier_2_subs
                 )
 
                 for sub_name in tier_2_subs:
                     try:
                         subreddit = await self.reddit.subreddit(sub_name)
                         for query in search_queries:
-                            async for submission in subreddit.search(query, limit=configs.POST_LIMIT):
-                                submissions.append(submission)
+                            submissions.extend(await self._search(subreddit, query, configs.POST_LIMIT))
                             if len(submissions) > configs.MIN_SUBMISSION_THRESHOLD:
                                 break
+                    except retry.CircuitOpenError as e:
+                        log.warning("%s Returning %s submissions found so far.", e, len(submissions))
+                        return submissions
                     except (APIException, RequestException, ServerError) as e:
-                        log.warning(f"Error searching in '{sub_name}': {e}")
+                        log.warning("Error searching in '%s': %s", sub_name, e)
                     searched_subreddits.append(sub_name)
                     if len(submissions) > configs.MIN_SUBMISSION_THRESHOLD:
                         break
@@ -465,62 +571,164 @@ class Bot:
                     break
         return submissions
 
-    @handle_api_exceptions()
+    async def load_corpus(self) -> planner.Corpus:
+        if self.corpus is None or time.time() - self.corpus_loaded_at > configs.PLANNER_CORPUS_TTL:
+            texts = (
+                await models.Reply.filter(text__isnull=False)
+                .order_by("-id")
+                .limit(configs.PLANNER_CORPUS_SIZE)
+                .values_list("text", flat=True)
+            )
+            comment_texts = (
+                await models.CorpusComment.all()
+                .order_by("-id")
+                .limit(configs.PLANNER_CORPUS_SIZE)
+                .values_list("body", flat=True)
+            )
+            self.corpus = planner.Corpus([*texts, *comment_texts])
+            self.corpus_loaded_at = time.time()
+            log.info("Query planner corpus loaded with %s documents.", self.corpus.size)
+
+        return self.corpus
+
+    async def record_shadow_reply(
+        self,
+        kind: str,
+        submission_id: str,
+        text: str,
+        reference: Comment,
+        subreddit_name: str,
+        candidates: int = 0,
+        mention_id: str | None = None,
+    ) -> None:
+        await self.writer.add(
+            "ShadowReply",
+            [
+                {
+                    "kind": kind,
+                    "text": text,
+                    "submission_id": submission_id,
+                    "mention_id": mention_id,
+                    "reference_submission_id": reference.submission.id,
+                    "reference_comment_id": reference.id,
+                    "reference_author": str(reference.author),
+                    "reference_score": reference.score,
+                    "candidates": candidates,
+                    "api_calls": int(metrics.current("api_requests")),
+                    "elapsed": metrics.elapsed(),
+                    "subreddit": subreddit_name,
+                }
+            ],
+        )
+        self.shadow_replies += 1
+        hours = max(time.monotonic() - self.started_at, 1) / 3600
+        log.info(
+            "Shadow reply %s recorded: %.1f replies/hour, %.1f API calls/reply.",
+            self.shadow_replies,
+            self.shadow_replies / hours,
+            metrics.counters["api_requests"] / self.shadow_replies,
+        )
+
+    @handle_api_exceptions(retry.READ, "inbox")
     async def mark_as_read(self, item: Message) -> None:
+        if self.shadow:
+            self.seen_mentions.add(item.id)
+            return
+
         await item.mark_read()
 
     async def reply_to_mention(self, mention: Message) -> bool:
-        log.info(f"New reply request received: {mention.id}")
+        log.info("New reply request received: %s", mention.id)
 
         try:
             if not mention.parent_id.startswith("t1_"):
-                log.warning(f"Parent of mention {mention.id} is not a comment, skipping.")
+                log.warning("Parent of mention %s is not a comment, skipping.", mention.id)
                 return False
 
-            original_comment = await self.reddit.comment(mention.parent_id)
-            await original_comment.load()
+            original_comment = await self.loader.comment(mention.parent_id.split("_", 1)[-1])
             keywords = original_comment.body.split()
         except (APIException, RequestException, ServerError) as e:
-            log.error(f"Failed to fetch original comment for mention {mention.id}: {e}")
+            log.error("Failed to fetch original comment for mention %s: %s", mention.id, e)
             return False
 
         if not keywords:
             log.warning("Comment to reply to is empty.")
             return False
 
-        search_queries = utils.get_keyword_combinations(keywords)
-        log.info(f"{len(search_queries)} different search queries created.")
+        corpus = await self.load_corpus()
+        query_plan = planner.plan_queries(original_comment.body, corpus)
+
+        if not query_plan:
+            log.warning("Comment to reply to has no searchable keywords.")
+            return False
+
+        search_queries = [planned.query for planned in query_plan]
+        log.info(
+            "%s search queries planned, expecting %.1f hits: %s",
+            len(search_queries),
+            sum(planned.expected_hits for planned in query_plan),
+            search_queries,
+        )
 
-        submissions = await self._perform_tiered_search(search_queries, original_comment.subreddit)
+        planned_keywords = {keyword for planned in query_plan for keyword in planned.keywords}
+        warm_submissions = self.pool.match(planned_keywords, exclude={original_comment.link_id.split("_", 1)[-1]})
+        submissions = await self._perform_tiered_search(
+            search_queries, original_comment.subreddit, warm_submissions=warm_submissions
+        )
 
-        best_comment = await self._find_best_comment_with_fallbacks(submissions, keywords, original_comment)
+        best_comment, reserved = await self._find_best_comment_with_fallbacks(submissions, keywords, original_comment)
 
         if best_comment:
-            log.info(f"Highest-rated comment found: '{best_comment.id}'")
+            log.info("Highest-rated comment found: '%s'", best_comment.id)
 
             if not best_comment.body.strip():
-                log.warning(f"Reply text for mention '{mention.id}' is empty or whitespace, skipping.")
+                log.warning("Reply text for mention '%s' is empty or whitespace, skipping.", mention.id)
+
+                if reserved:
+                    await self.leases.release_comment(best_comment.id)
                 return False
 
             comment_text = best_comment.body.strip()[:10000]
-            bot_comment = await mention.reply(comment_text)
+
+            if self.shadow:
+                await self.record_shadow_reply(
+                    "mention",
+                    original_comment.submission.id,
+                    comment_text,
+                    best_comment,
+                    original_comment.subreddit.display_name,
+                    mention_id=mention.id,
+                )
+                return True
+
+            try:
+                bot_comment = await retry.call(lambda: mention.reply(comment_text), retry.WRITE, "reply")
+            except Exception:
+                if reserved:
+                    await self.leases.release_comment(best_comment.id)
+                raise
 
             if not bot_comment:
-                log.error(f"Failed to send reply to mention {mention.id}")
+                log.error("Failed to send reply to mention %s", mention.id)
+
+                if reserved:
+                    await self.leases.release_comment(best_comment.id)
                 return False
 
-            log.info(f"Reply sent to comment with ID '{mention.id}'.")
-            subreddit_name = original_comment.subreddit.display_name
-            subreddit_obj, created = await models.Subreddit.get_or_create(name=subreddit_name)
-
-            await models.Reply.create(
-                text=best_comment.body,
-                submission_id=original_comment.submission.id,
-                comment_id=bot_comment.id,
-                reference_submission_id=best_comment.submission.id,
-                reference_comment_id=best_comment.id,
-                reference_author=str(best_comment.author),
-                subreddit=subreddit_obj,
+            log.info("Reply sent to comment with ID '%s'.", mention.id)
+            await self.writer.add(
+                "Reply",
+                [
+                    {
+                        "text": best_comment.body,
+                        "submission_id": original_comment.submission.id,
+                        "comment_id": bot_comment.id,
+                        "reference_submission_id": best_comment.submission.id,
+                        "reference_comment_id": best_comment.id,
+                        "reference_author": str(best_comment.author),
+                        "subreddit": original_comment.subreddit.display_name,
+                    }
+                ],
             )
             return True
 
@@ -529,72 +737,190 @@ class Bot:
             return False
 
 
+async def process_inbox(bot: Bot) -> None:
+    async for item in bot.reddit.inbox.unread(limit=None):
+        if item.type == "comment_reply":
+            if item.id in bot.seen_mentions:
+                continue
+
+            if not await bot.leases.acquire(f"mention:{item.id}", configs.MENTION_LEASE_TTL):
+                log.info("Mention %s is claimed by another worker, skipping.", item.id)
+                continue
+
+            try:
+                with metrics.track(), bot.busy():
+                    success = await bot.reply_to_mention(item)
+                if success:
+                    await bot.mark_as_read(item)
+                else:
+                    log.warning("Failed to process mention %s, marking as read to avoid loop.", item.id)
+                    await bot.mark_as_read(item)
+            except Exception as e:
+                log.error("An unexpected error occurred while processing mention %s: %s", item.id, e)
+                await bot.mark_as_read(item)
+
+
 async def check_inbox(bot: Bot) -> None:
     while True:
         try:
-            async for item in bot.reddit.inbox.unread(limit=None):
-                if item.type == "comment_reply":
-                    try:
-                        success = await bot.reply_to_mention(item)
-                        if success:
-                            await bot.mark_as_read(item)
-                        else:
-                            log.warning(f"Failed to process mention {item.id}, marking as read to avoid loop.")
-                            await bot.mark_as_read(item)
-                    except Exception as e:
-                        log.error(f"An unexpected error occurred while processing mention {item.id}: {e}")
-                        await bot.mark_as_read(item)
+            if await bot.leases.acquire(f"inbox:{bot.account}", configs.INBOX_LEASE_TTL):
+                await process_inbox(bot)
         except (APIException, RequestException, ServerError) as e:
-            log.error(f"An error occurred while checking inbox: {e}")
+            log.error("An error occurred while checking inbox: %s", e)
+        except Exception as e:
+            log.error("An unexpected error occurred while checking inbox: %s", e)
 
         await asyncio.sleep(configs.INBOX_CHECK_INTERVAL)
 
 
-@handle_api_exceptions()
 async def run_comment_processor(bot: Bot) -> None:
+    scheduler = Scheduler(persist=not bot.shadow)
+    await scheduler.refresh()
+
     while True:
-        await bot.setup()
+        try:
+            subreddit_name = await scheduler.claim(bot.leases)
 
-        if time.strftime("%H") in configs.WORKING_HOURS:
-            log.info("Processing a random post...")
-            await bot.process_post()
+            if not subreddit_name:
+                log.info("All subreddits are claimed by other workers.")
+                await asyncio.sleep(scheduler.sleep_duration())
+                continue
 
-        min_sleep_seconds, max_sleep_seconds = (
-            configs.MIN_SLEEP_MINUTES * 60,
-            configs.MAX_SLEEP_MINUTES * 60,
-        )
-        sleep_duration = random.randint(min_sleep_seconds, max_sleep_seconds)
+            await bot.setup(subreddit_name)
+
+            if bot.shadow or time.strftime("%H") in configs.WORKING_HOURS:
+                log.info("Processing a random post from r/%s...", subreddit_name)
+
+                with metrics.track() as counter, bot.busy():
+                    success = await bot.process_post()
+
+                await scheduler.record(
+                    bot.subreddit_obj,
+                    success=bool(success),
+                    api_calls=counter["api_requests"],
+                    candidates=len(bot.submissions),
+                    velocity=bot.velocity,
+                )
+                log.info("API counters: %s", dict(metrics.counters))
+        except Exception as e:
+            log.error("An unexpected error occurred in the comment processor: %s", e)
+
+        if bot.shadow:
+            await asyncio.sleep(configs.SHADOW_SLEEP)
+            continue
+
+        sleep_duration = scheduler.sleep_duration()
+        log.info("Sleeping for %s seconds before the next run.", sleep_duration)
         await asyncio.sleep(sleep_duration)
 
 
-async def main() -> None:
+async def profile_run(bot: Bot, args: argparse.Namespace) -> None:
+    profiler = Profiler()
+
+    if args.mention_id:
+        target = f"mention-{args.mention_id}"
+        mention = await bot.reddit.comment(args.mention_id)
+        await mention.load()
+    else:
+        if args.submission_id:
+            target = f"submission-{args.submission_id}"
+            submission = await bot.loader.submission(args.submission_id)
+            subreddit_name = submission.subreddit.display_name
+        else:
+            scheduler = Scheduler()
+            await scheduler.refresh()
+            subreddit_name = args.subreddit or scheduler.choose()
+            target = f"subreddit-{subreddit_name}"
+
+        await bot.setup(subreddit_name)
+
+    log.info("Profiling a single run for %s...", target)
+
+    async with profiler.running():
+        with metrics.track(), bot.busy():
+            if args.mention_id:
+                success = await bot.reply_to_mention(mention)
+            else:
+                success = await bot.process_post(args.submission_id)
+
+    summary_path = profiler.write(target)
+    log.info("Profiled run finished with success=%s, summary written to '%s'.", bool(success), summary_path)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="koyunkapan.bot.core")
+    parser.add_argument("--account", default="bot", help="praw.ini section to log in with")
+    parser.add_argument("--worker-id", default=None, help="unique worker name used for database leases")
+    parser.add_argument("--shadow", action="store_true", help="run the pipeline without posting, into ShadowReply")
+    parser.add_argument("--profile", action="store_true", help="profile a single pipeline run and exit")
+    parser.add_argument("--submission-id", default=None, help="submission to process when profiling")
+    parser.add_argument("--subreddit", default=None, help="subreddit to pick a submission from when profiling")
+    parser.add_argument("--mention-id", default=None, help="mention comment to reply to when profiling")
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
     config_path = os.path.join(configs.DATA_DIR, "praw.ini")
     config = configparser.ConfigParser()
     config.read(config_path)
 
     async with asyncpraw.Reddit(
-        client_id=config.get("bot", "client_id"),
-        client_secret=config.get("bot", "client_secret"),
-        user_agent=config.get("bot", "user_agent"),
-        username=config.get("bot", "username"),
-        password=config.get("bot", "password"),
+        client_id=config.get(args.account, "client_id"),
+        client_secret=config.get(args.account, "client_secret"),
+        user_agent=config.get(args.account, "user_agent"),
+        username=config.get(args.account, "username"),
+        password=config.get(args.account, "password"),
+        requestor_class=metrics.CountingRequestor,
     ) as reddit:
         if reddit.read_only:
-            log.warnings("Connected in read-only mode. Check praw.ini configuration.")
+            log.warning("Connected in read-only mode. Check praw.ini configuration.")
             return
 
-        log.info(f"Logged in as '{await reddit.user.me()}'")
+        log.info("Logged in as '%s'", await reddit.user.me())
 
         await database.init()
-        bot = Bot(reddit)
+        if args.shadow:
+            leases = ShadowLeaseManager(args.worker_id)
+            writer = WriteBehind(f"{args.worker_id or args.account}-shadow")
+            log.info("Shadow mode: replies are recorded in ShadowReply instead of being posted.")
+        else:
+            leases = LeaseManager(args.worker_id)
+            writer = WriteBehind(args.worker_id or args.account)
+
+        try:
+            writer.acquire()
+        except RuntimeError as e:
+            log.error("%s Use a unique --worker-id per worker.", e)
+            await database.close()
+            return
 
-        inbox_task = asyncio.create_task(check_inbox(bot))
-        processor_task = asyncio.create_task(run_comment_processor(bot))
+        log.info("Worker '%s' started with account '%s'.", leases.owner, args.account)
 
-        await asyncio.gather(inbox_task, processor_task)
+        if writer.replay():
+            log.info("Replaying %s journaled rows from '%s'.", len(writer.pending), writer.path)
+            await writer.flush()
+
+        bot = Bot(reddit, leases, writer, account=args.account, shadow=args.shadow)
+
+        try:
+            if args.profile:
+                await profile_run(bot, args)
+            else:
+                inbox_task = asyncio.create_task(check_inbox(bot))
+                processor_task = asyncio.create_task(run_comment_processor(bot))
+                harvester_task = asyncio.create_task(Harvester(bot).run())
+                writer_task = asyncio.create_task(writer.run())
+                tasks = [inbox_task, processor_task, harvester_task, writer_task]
+
+                if not args.shadow:
+                    tasks.append(asyncio.create_task(retention.run(leases)))
+
+                await asyncio.gather(*tasks)
+        finally:
+            await writer.close()
 
     await database.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))
@@ -1,28 +1,33 @@
-from tortoise import Tortoise
-
 from . import configs
 
-database_file = configs.DB_FILE
-TORTOISE_ORM = {
-    "connections": {"default": f"sqlite://{database_file}"},
-    "apps": {
-        "models": {
-            "models": ["koyunkapan.bot.models"],
-            "default_connection": "default",
-        },
-    },
-}
 _db_initialized = False
 
 
+def __getattr__(name: str) -> dict:
+    if name == "TORTOISE_ORM":
+        return {
+            "connections": {"default": configs.DB_URL},
+            "apps": {
+                "models": {
+                    "models": ["koyunkapan.bot.models"],
+                    "default_connection": "default",
+                },
+            },
+        }
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 async def init() -> None:
     global _db_initialized
 
     if _db_initialized:
         return
 
+    from tortoise import Tortoise
+
     await Tortoise.init(
-        db_url=f"sqlite://{database_file}",
+        db_url=configs.DB_URL,
         modules={"models": ["koyunkapan.bot.models"]},
     )
     await Tortoise.generate_schemas()
@@ -30,4 +35,9 @@ async def init() -> None:
 
 
 async def close() -> None:
+    global _db_initialized
+
+    from tortoise import Tortoise
+
     await Tortoise.close_connections()
+    _db_initialized = False
@@ -0,0 +1,150 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+
+from asyncpraw.exceptions import APIException
+from asyncpraw.models import Submission
+from asyncprawcore.exceptions import RequestException, ServerError
+
+from . import configs, planner, retry
+from .logger import Logger
+
+log = Logger()
+
+
+class CandidatePool:
+    def __init__(self) -> None:
+        self.submissions: OrderedDict[str, tuple[float, Submission]] = OrderedDict()
+
+    def __contains__(self, submission_id: str) -> bool:
+        return self.get(submission_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.submissions)
+
+    def add(self, submission: Submission) -> None:
+        self.submissions[submission.id] = (time.monotonic(), submission)
+        self.submissions.move_to_end(submission.id)
+        self.prune()
+
+    def get(self, submission_id: str) -> Submission | None:
+        entry = self.submissions.get(submission_id)
+
+        if entry is None:
+            return None
+
+        loaded_at, submission = entry
+
+        if time.monotonic() - loaded_at > configs.HARVESTER_TTL:
+            self.submissions.pop(submission_id)
+            return None
+
+        return submission
+
+    def for_subreddit(self, subreddit_name: str) -> list[Submission]:
+        self.prune()
+        return [
+            submission
+            for loaded_at, submission in self.submissions.values()
+            if submission.subreddit.display_name.lower() == subreddit_name.lower()
+        ]
+
+    def match(self, keywords: set[str], exclude: set[str] = frozenset()) -> list[Submission]:
+        self.prune()
+        matches = []
+
+        for loaded_at, submission in self.submissions.values():
+            overlap = len(keywords & set(planner.normalize(submission.title)))
+
+            if overlap and submission.id not in exclude:
+                matches.append((overlap, submission))
+
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return [submission for overlap, submission in matches[: configs.MIN_SUBMISSION_THRESHOLD]]
+
+    def prune(self) -> None:
+        now = time.monotonic()
+
+        while self.submissions:
+            loaded_at, submission = next(iter(self.submissions.values()))
+
+            if now - loaded_at <= configs.HARVESTER_TTL and len(self.submissions) <= configs.HARVESTER_POOL_SIZE:
+                break
+
+            self.submissions.popitem(last=False)
+
+
+class Harvester:
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.reddit = bot.reddit
+        self.pool = bot.pool
+
+    def has_budget(self) -> bool:
+        remaining = self.reddit.auth.limits["remaining"]
+        return remaining is None or remaining > configs.HARVESTER_RESERVED_REQUESTS
+
+    async def wait_for_idle(self) -> None:
+        while self.bot.active or not self.has_budget():
+            await asyncio.sleep(configs.HARVESTER_INTERVAL)
+
+    async def harvest_submission(self, submission: Submission) -> None:
+        submission = await self.bot.loader.submission(submission.id)
+        self.pool.add(submission)
+
+        corpus_comments = [
+            {
+                "comment_id": comment.id,
+                "submission_id": submission.id,
+                "body": comment.body,
+                "score": comment.score,
+                "subreddit": submission.subreddit.display_name,
+            }
+            async for comment in self.bot.loader.iter_comments(submission.comments, configs.TOP_COMMENT_LIMIT)
+            if comment.body not in configs.FORBIDDEN_COMMENTS
+        ]
+        await self.bot.writer.add("CorpusComment", corpus_comments)
+
+    async def harvest_subreddit(self, subreddit_name: str) -> int:
+        subreddit = await self.reddit.subreddit(subreddit_name)
+        harvested = 0
+
+        async def _collect():
+            new = [submission async for submission in subreddit.new(limit=configs.POST_LIMIT)]
+            hot = [submission async for submission in subreddit.hot(limit=configs.POST_LIMIT)]
+            return new + hot
+
+        candidates = await retry.call(_collect, endpoint="listing")
+
+        for submission in candidates:
+            if submission.id in self.pool or submission.link_flair_text == configs.FORBIDDEN_FLAIR:
+                continue
+
+            await self.wait_for_idle()
+            await self.harvest_submission(submission)
+            harvested += 1
+            await asyncio.sleep(configs.HARVESTER_INTERVAL)
+
+        return harvested
+
+    async def run(self) -> None:
+        subreddit_names = itertools.cycle(list(configs.SUBREDDIT_WEIGHTS.keys()))
+
+        while True:
+            subreddit_name = next(subreddit_names)
+            await self.wait_for_idle()
+
+            try:
+                harvested = await self.harvest_subreddit(subreddit_name)
+                log.debug(
+                    "Harvested %s submissions from r/%s, pool size %s.", harvested, subreddit_name, len(self.pool)
+                )
+            except retry.CircuitOpenError as e:
+                log.warning("%s Pausing the harvester.", e)
+            except (APIException, RequestException, ServerError) as e:
+                log.warning("Error harvesting r/%s: %s", subreddit_name, e)
+            except Exception as e:
+                log.error("An unexpected error occurred while harvesting r/%s: %s", subreddit_name, e)
+
+            await asyncio.sleep(configs.HARVESTER_INTERVAL)
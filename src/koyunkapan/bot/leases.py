@@ -0,0 +1,71 @@
+import os
+import socket
+from datetime import timedelta
+
+from tortoise import timezone
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
+
+from . import models
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseManager:
+    def __init__(self, owner: str | None = None) -> None:
+        self.owner = owner or default_owner()
+
+    async def acquire(self, key: str, ttl: int) -> bool:
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=ttl)
+
+        try:
+            await models.Lease.create(key=key, owner=self.owner, expires_at=expires_at)
+            return True
+        except IntegrityError:
+            pass
+
+        updated = await models.Lease.filter(Q(owner=self.owner) | Q(expires_at__lt=now), key=key).update(
+            owner=self.owner, expires_at=expires_at
+        )
+        return updated > 0
+
+    async def release(self, key: str) -> None:
+        await models.Lease.filter(key=key, owner=self.owner).delete()
+
+    async def reserve_comment(self, comment_id: str) -> bool:
+        if await models.Reply.filter(reference_comment_id=comment_id).exists():
+            return False
+
+        try:
+            await models.Reservation.create(comment_id=comment_id, owner=self.owner)
+            return True
+        except IntegrityError:
+            return False
+
+    async def release_comment(self, comment_id: str) -> None:
+        await models.Reservation.filter(comment_id=comment_id, owner=self.owner).delete()
+
+
+class ShadowLeaseManager(LeaseManager):
+    def __init__(self, owner: str | None = None) -> None:
+        super().__init__(owner)
+        self.reserved: set[str] = set()
+
+    async def acquire(self, key: str, ttl: int) -> bool:
+        return True
+
+    async def release(self, key: str) -> None:
+        pass
+
+    async def reserve_comment(self, comment_id: str) -> bool:
+        if comment_id in self.reserved or await models.Reply.filter(reference_comment_id=comment_id).exists():
+            return False
+
+        self.reserved.add(comment_id)
+        return True
+
+    async def release_comment(self, comment_id: str) -> None:
+        self.reserved.discard(comment_id)
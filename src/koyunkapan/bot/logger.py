@@ -1,9 +1,154 @@
+import atexit
+import copy
+import fcntl
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
 from datetime import datetime
 
 from . import configs
 
 
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, rotate_interval: int) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.rotate_interval = rotate_interval
+        self.opened_at = time.time()
+
+    def rotated_elsewhere(self) -> bool:
+        if self.stream is None:
+            return False
+
+        try:
+            return os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def reopen(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+
+        self.stream = self._open()
+        self.opened_at = time.time()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rotated_elsewhere():
+            self.reopen()
+
+        if self.rotate_interval and time.time() - self.opened_at >= self.rotate_interval:
+            return True
+
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        with open(self.baseFilename + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            try:
+                if self.rotated_elsewhere():
+                    self.reopen()
+                    return
+
+                super().doRollover()
+                self.opened_at = time.time()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def flush(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        super().flush()
+
+    def close(self) -> None:
+        self.commit()
+        super().close()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
+class QueueListener:
+    STOP = None
+
+    def __init__(self, log_queue: queue.SimpleQueue, handlers: list[logging.Handler]) -> None:
+        self.queue = log_queue
+        self.handlers = handlers
+        self.thread = threading.Thread(target=self._run, name="koyunkapan-log", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(self.STOP)
+            self.thread.join()
+
+        for handler in self.handlers:
+            handler.close()
+
+    def _handle(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _commit(self) -> None:
+        for handler in self.handlers:
+            getattr(handler, "commit", handler.flush)()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                record = self.queue.get(timeout=configs.LOG_FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+
+            batch = [record]
+
+            while record is not self.STOP and len(batch) < configs.LOG_BATCH_SIZE:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                batch.append(record)
+
+            for record in batch:
+                if record is self.STOP:
+                    self._commit()
+                    return
+
+                self._handle(record)
+
+            self._commit()
+
+
 class Logger:
     LEVELS = {
         "DEBUG": logging.DEBUG,
@@ -13,20 +158,40 @@ class Logger:
         "CRITICAL": logging.CRITICAL,
     }
     TEMPLATE = "[%(asctime)s] [%(levelname)s] %(message)s"
+    _listener = None
+    _lock = threading.Lock()
 
     def __init__(self, level: str = "INFO") -> None:
-        self.log_file = configs.LOG_FILE
-
         self.level = self.LEVELS.get(level.upper(), logging.INFO)
-        self.logger = logging.getLogger("koyunkapan")
-        self.logger.setLevel(self.level)
+        self._logger = logging.getLogger("koyunkapan")
 
-        if self.logger.hasHandlers():
-            self.logger.handlers.clear()
+    @property
+    def logger(self) -> logging.Logger:
+        if Logger._listener is None:
+            with Logger._lock:
+                if Logger._listener is None:
+                    self._configure()
 
-        formatter = logging.Formatter(Logger.TEMPLATE, datefmt="%Y-%m-%d %H:%M:%S")
+        return self._logger
 
-        file_handler = logging.FileHandler(self.log_file, encoding="utf-8")
+    def _configure(self) -> None:
+        self.log_file = configs.LOG_FILE
+        self._logger.setLevel(self.level)
+
+        if self._logger.hasHandlers():
+            self._logger.handlers.clear()
+
+        if configs.LOG_FORMAT == "json":
+            formatter = JsonFormatter(datefmt="%Y-%m-%d %H:%M:%S")
+        else:
+            formatter = logging.Formatter(Logger.TEMPLATE, datefmt="%Y-%m-%d %H:%M:%S")
+
+        file_handler = BatchedRotatingFileHandler(
+            self.log_file,
+            max_bytes=configs.LOG_MAX_BYTES,
+            backup_count=configs.LOG_BACKUP_COUNT,
+            rotate_interval=configs.LOG_ROTATE_INTERVAL,
+        )
         file_handler.setLevel(self.level)
         file_handler.setFormatter(formatter)
 
@@ -34,10 +199,14 @@ class Logger:
         console_handler.setLevel(self.level)
         console_handler.setFormatter(formatter)
 
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        log_queue = queue.SimpleQueue()
+        Logger._listener = QueueListener(log_queue, [file_handler, console_handler])
+        Logger._listener.start()
+        atexit.register(Logger._listener.stop)
 
-        self.logger.info("--- Log started at %s ---", datetime.now())
+        self._logger.addHandler(DeferredQueueHandler(log_queue))
+        self._logger.propagate = False
+        self._logger.info("--- Log started at %s ---", datetime.now())
 
     def debug(self, message: str, *args) -> None:
         self.logger.debug(message, *args)
@@ -0,0 +1,55 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+counters = Counter()
+_task_counters: ContextVar[Counter | None] = ContextVar("task_counters", default=None)
+_task_started: ContextVar[float | None] = ContextVar("task_started", default=None)
+
+
+def increment(name: str, value: float = 1) -> None:
+    counters[name] += value
+    task_counter = _task_counters.get()
+
+    if task_counter is not None:
+        task_counter[name] += value
+
+
+@contextmanager
+def track() -> Iterator[Counter]:
+    task_counter = Counter()
+    token = _task_counters.set(task_counter)
+    started_token = _task_started.set(time.monotonic())
+
+    try:
+        yield task_counter
+    finally:
+        _task_counters.reset(token)
+        _task_started.reset(started_token)
+
+
+def current(name: str) -> float:
+    task_counter = _task_counters.get()
+    return task_counter[name] if task_counter is not None else 0
+
+
+def elapsed() -> float:
+    started = _task_started.get()
+    return time.monotonic() - started if started is not None else 0.0
+
+
+def __getattr__(name: str) -> type:
+    if name == "CountingRequestor":
+        import asyncprawcore
+
+        class CountingRequestor(asyncprawcore.Requestor):
+            async def request(self, *args, **kwargs):
+                increment("api_requests")
+                return await super().request(*args, **kwargs)
+
+        globals()[name] = CountingRequestor
+        return CountingRequestor
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
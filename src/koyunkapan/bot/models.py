@@ -36,3 +36,77 @@ class Reply(Model):
 
     class Meta:
         table = "Reply"
+
+
+class ArchivedReply(Model):
+    id = fields.IntField(pk=True, generated=False)
+    text = fields.BinaryField(null=True)
+    archived_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "ArchivedReply"
+
+
+class ShadowReply(Model):
+    id = fields.IntField(pk=True)
+    kind = fields.CharField(max_length=32)
+    text = fields.TextField(null=True)
+    submission_id = fields.CharField(max_length=255)
+    mention_id = fields.CharField(max_length=255, null=True)
+    reference_submission_id = fields.CharField(max_length=255)
+    reference_comment_id = fields.CharField(max_length=255)
+    reference_author = fields.CharField(max_length=255)
+    reference_score = fields.IntField(default=0)
+    candidates = fields.IntField(default=0)
+    api_calls = fields.IntField(default=0)
+    elapsed = fields.FloatField(default=0.0)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    subreddit = fields.ForeignKeyField("models.Subreddit", related_name="shadow_replies", null=True)
+
+    class Meta:
+        table = "ShadowReply"
+
+
+class CorpusComment(Model):
+    id = fields.IntField(pk=True)
+    comment_id = fields.CharField(max_length=255, unique=True)
+    submission_id = fields.CharField(max_length=255)
+    body = fields.TextField(null=True)
+    score = fields.IntField(default=0)
+    subreddit = fields.ForeignKeyField("models.Subreddit", related_name="corpus_comments", null=True)
+
+    class Meta:
+        table = "CorpusComment"
+
+
+class Run(Model):
+    id = fields.IntField(pk=True)
+    success = fields.BooleanField(default=False)
+    api_calls = fields.IntField(default=0)
+    candidates = fields.IntField(default=0)
+    velocity = fields.FloatField(default=0.0)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    subreddit = fields.ForeignKeyField("models.Subreddit", related_name="runs", null=True)
+
+    class Meta:
+        table = "Run"
+
+
+class Lease(Model):
+    id = fields.IntField(pk=True)
+    key = fields.CharField(max_length=255, unique=True)
+    owner = fields.CharField(max_length=255)
+    expires_at = fields.DatetimeField()
+
+    class Meta:
+        table = "Lease"
+
+
+class Reservation(Model):
+    id = fields.IntField(pk=True)
+    comment_id = fields.CharField(max_length=255, unique=True)
+    owner = fields.CharField(max_length=255)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "Reservation"
@@ -0,0 +1,222 @@
+import asyncio
+import fcntl
+import json
+import os
+import threading
+from typing import Any
+
+from tortoise.transactions import in_transaction
+
+from . import configs, models
+from .logger import Logger
+
+log = Logger()
+
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+
+
+class WriteBehind:
+    def __init__(
+        self,
+        name: str,
+        batch_size: int = configs.PERSIST_BATCH_SIZE,
+        flush_interval: float = configs.PERSIST_FLUSH_INTERVAL,
+    ) -> None:
+        self.path = os.path.join(configs.DATA_DIR, f"journal-{name}.jsonl")
+        self.dead_letter_path = os.path.join(configs.DATA_DIR, f"journal-{name}.dead.jsonl")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending: list[dict[str, Any]] = []
+        self.wake = asyncio.Event()
+        self.lock = asyncio.Lock()
+        self.journal_lock = asyncio.Lock()
+        self.io_lock = threading.Lock()
+        self.journal = None
+        self.lock_file = None
+
+    def acquire(self) -> None:
+        self.lock_file = open(self.path + ".lock", "w")
+
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.lock_file.close()
+            self.lock_file = None
+            raise RuntimeError(f"Journal '{self.path}' is used by another worker.")
+
+    def _open(self) -> None:
+        self.journal = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, entries: list[dict[str, Any]]) -> None:
+        with self.io_lock:
+            if self.journal is None:
+                self._open()
+
+            self.journal.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+
+    def _dead_letter(self, entries: list[dict[str, Any]]) -> None:
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite(self, entries: list[dict[str, Any]]) -> None:
+        with self.io_lock:
+            if self.journal is not None:
+                self.journal.close()
+
+            temp_path = self.path + ".tmp"
+
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(temp_path, self.path)
+            self._open()
+
+    async def _discard(self, count: int) -> None:
+        async with self.journal_lock:
+            self.pending = self.pending[count:]
+            await asyncio.to_thread(self._rewrite, list(self.pending))
+
+    async def add(self, model: str, rows: list[dict[str, Any]]) -> None:
+        entries = [{"model": model, "row": row} for row in rows]
+
+        if not entries:
+            return
+
+        async with self.journal_lock:
+            self.pending.extend(entries)
+            await asyncio.to_thread(self._append, entries)
+
+        if len(self.pending) >= self.batch_size:
+            self.wake.set()
+
+    def replay(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self.pending.append(json.loads(line))
+                except json.JSONDecodeError:
+                    log.warning("Skipping a truncated journal entry in '%s'.", self.path)
+
+        return len(self.pending)
+
+    async def _resolve(self, rows: list[dict[str, Any]], connection) -> None:
+        names = {row["subreddit"] for row in rows if row.get("subreddit")}
+        subreddits = {}
+
+        for name in names:
+            subreddits[name], created = await models.Subreddit.get_or_create(name=name, using_db=connection)
+
+        fids = {row["flair"] for row in rows if row.get("flair")}
+        flairs = {}
+
+        if fids:
+            for flair in await models.Flair.filter(fid__in=fids).using_db(connection):
+                flairs[(flair.subreddit_id, flair.fid)] = flair
+
+        for row in rows:
+            row["subreddit"] = subreddits.get(row.get("subreddit"))
+
+            if "flair" in row:
+                row["flair"] = flairs.get((row["subreddit"].id if row["subreddit"] else None, row["flair"]))
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        replies = [dict(entry["row"]) for entry in batch if entry["model"] == "Reply"]
+        corpus = [dict(entry["row"]) for entry in batch if entry["model"] == "CorpusComment"]
+        shadow_replies = [dict(entry["row"]) for entry in batch if entry["model"] == "ShadowReply"]
+
+        async with in_transaction() as connection:
+            await self._resolve(replies + corpus + shadow_replies, connection)
+
+            if replies:
+                existing = set(
+                    await models.Reply.filter(comment_id__in=[row["comment_id"] for row in replies])
+                    .using_db(connection)
+                    .values_list("comment_id", flat=True)
+                )
+                unique = {row["comment_id"]: row for row in replies if row["comment_id"] not in existing}
+
+                if unique:
+                    await models.Reply.bulk_create(
+                        [models.Reply(**row) for row in unique.values()], using_db=connection
+                    )
+
+            if corpus:
+                await models.CorpusComment.bulk_create(
+                    [models.CorpusComment(**row) for row in corpus], ignore_conflicts=True, using_db=connection
+                )
+
+            if shadow_replies:
+                await models.ShadowReply.bulk_create(
+                    [models.ShadowReply(**row) for row in shadow_replies], using_db=connection
+                )
+
+    async def flush(self) -> int:
+        async with self.lock:
+            if not self.pending:
+                return 0
+
+            batch = list(self.pending)
+
+            try:
+                await self._write(batch)
+            except TRANSIENT_ERRORS as e:
+                log.error("Failed to persist %s queued rows, keeping them for the next flush: %s", len(batch), e)
+                return 0
+            except Exception as e:
+                log.warning("Failed to persist %s queued rows, retrying them one at a time: %s", len(batch), e)
+                return await self._flush_each(batch)
+
+            await self._discard(len(batch))
+            log.debug("Persisted %s queued rows.", len(batch))
+            return len(batch)
+
+    async def _flush_each(self, batch: list[dict[str, Any]]) -> int:
+        done, dead = 0, []
+
+        for entry in batch:
+            try:
+                await self._write([entry])
+            except TRANSIENT_ERRORS as e:
+                log.error("Failed to persist queued rows, keeping the rest for the next flush: %s", e)
+                break
+            except Exception as e:
+                log.error("Moving a %s row to '%s': %s", entry["model"], self.dead_letter_path, e)
+                dead.append({**entry, "error": str(e)})
+
+            done += 1
+
+        if dead:
+            await asyncio.to_thread(self._dead_letter, dead)
+
+        await self._discard(done)
+        return done - len(dead)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self.wake.clear()
+            await self.flush()
+
+    async def close(self) -> None:
+        await self.flush()
+
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
@@ -0,0 +1,186 @@
+import itertools
+import math
+import re
+from collections import Counter
+from typing import Iterable, NamedTuple
+
+from . import configs
+
+TURKISH_CASE = str.maketrans({"I": "ı", "İ": "i"})
+PUNCTUATION = re.compile(r"[^\w\s]|_", re.UNICODE)
+STOP_WORDS = frozenset(
+    {
+        "acaba",
+        "ama",
+        "ancak",
+        "artık",
+        "aslında",
+        "bana",
+        "bazı",
+        "belki",
+        "ben",
+        "beni",
+        "benim",
+        "bile",
+        "bir",
+        "biraz",
+        "birçok",
+        "biri",
+        "birkaç",
+        "birşey",
+        "biz",
+        "bize",
+        "bizi",
+        "bizim",
+        "bu",
+        "buna",
+        "bunu",
+        "bunun",
+        "burada",
+        "çok",
+        "çünkü",
+        "da",
+        "daha",
+        "de",
+        "değil",
+        "diye",
+        "en",
+        "gibi",
+        "hem",
+        "hep",
+        "hepsi",
+        "her",
+        "hiç",
+        "için",
+        "ile",
+        "ise",
+        "işte",
+        "kadar",
+        "ki",
+        "kim",
+        "mi",
+        "mı",
+        "mu",
+        "mü",
+        "nasıl",
+        "ne",
+        "neden",
+        "nerede",
+        "niye",
+        "o",
+        "olan",
+        "olarak",
+        "oldu",
+        "olduğu",
+        "olsun",
+        "on",
+        "ona",
+        "onu",
+        "onun",
+        "sadece",
+        "sana",
+        "sen",
+        "seni",
+        "senin",
+        "siz",
+        "şey",
+        "şu",
+        "şuna",
+        "şunu",
+        "tüm",
+        "var",
+        "ve",
+        "veya",
+        "ya",
+        "yani",
+        "yine",
+        "yok",
+        "zaten",
+    }
+)
+
+
+class PlannedQuery(NamedTuple):
+    query: str
+    keywords: tuple[str, ...]
+    expected_hits: float
+
+
+def turkish_lower(text: str) -> str:
+    return text.translate(TURKISH_CASE).lower()
+
+
+def normalize(text: str) -> list[str]:
+    text = PUNCTUATION.sub(" ", turkish_lower(text))
+    return [word for word in text.split() if len(word) > 1 and not word.isdigit() and word not in STOP_WORDS]
+
+
+class Corpus:
+    def __init__(self, documents: Iterable[str] = ()) -> None:
+        self.size = 0
+        self.document_frequency = Counter()
+
+        for document in documents:
+            self.add(document)
+
+    def add(self, document: str | None) -> None:
+        words = set(normalize(document or ""))
+
+        if words:
+            self.size += 1
+            self.document_frequency.update(words)
+
+    def idf(self, word: str) -> float:
+        return math.log((self.size + 1) / (self.document_frequency[word] + 1)) + 1
+
+    def share(self, word: str) -> float:
+        return (self.document_frequency[word] + 1) / (self.size + 2)
+
+    def matches(self, words: Iterable[str]) -> float:
+        return configs.PLANNER_SEARCH_POPULATION * math.prod(self.share(word) for word in words)
+
+    def expected_hits(self, words: Iterable[str]) -> float:
+        return min(float(configs.POST_LIMIT), self.matches(words))
+
+
+def rank_keywords(text: str, corpus: Corpus) -> list[str]:
+    words = normalize(text) or PUNCTUATION.sub(" ", turkish_lower(text)).split()
+    words = list(dict.fromkeys(words))
+    words.sort(key=corpus.idf, reverse=True)
+    return words[: configs.PLANNER_KEYWORD_LIMIT]
+
+
+def plan_queries(text: str, corpus: Corpus) -> list[PlannedQuery]:
+    keywords = rank_keywords(text, corpus)
+    candidates = []
+
+    for size in range(1, min(len(keywords), 3) + 1):
+        for combo in itertools.combinations(keywords, size):
+            candidates.append(
+                PlannedQuery(
+                    query=" AND ".join(f'"{word}"' for word in combo),
+                    keywords=combo,
+                    expected_hits=corpus.expected_hits(combo),
+                )
+            )
+
+    candidates.sort(key=lambda c: (c.expected_hits, -len(c.keywords)))
+    plan = []
+    total_hits = 0.0
+
+    for candidate in candidates:
+        covered = sum(
+            corpus.matches(chosen.keywords) for chosen in plan if set(candidate.keywords) <= set(chosen.keywords)
+        )
+        gain = min(float(configs.POST_LIMIT), corpus.matches(candidate.keywords) - covered)
+
+        if gain <= 0 or (len(candidate.keywords) > 1 and gain < configs.PLANNER_MIN_EXPECTED_HITS):
+            continue
+
+        plan.append(candidate)
+        total_hits += gain
+
+        if len(plan) >= configs.PLANNER_MAX_QUERIES or total_hits >= configs.MIN_SUBMISSION_THRESHOLD:
+            break
+
+    return plan
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import FrameType
+from typing import AsyncIterator
+
+from . import configs, metrics
+
+IDLE_FUNCTIONS = {("selectors.py", "select"), ("selectors.py", "poll")}
+
+
+def frame_label(frame: FrameType) -> str:
+    return f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+
+
+def thread_stack(frame: FrameType | None) -> list[FrameType]:
+    frames = []
+
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+
+    return frames[::-1]
+
+
+def coroutine_stack(coroutine) -> list[str]:
+    labels = []
+
+    while coroutine is not None:
+        frame = getattr(coroutine, "cr_frame", None) or getattr(coroutine, "gi_frame", None)
+        frame = frame or getattr(coroutine, "ag_frame", None)
+
+        if frame is None:
+            break
+
+        labels.append(frame_label(frame))
+        coroutine = (
+            getattr(coroutine, "cr_await", None)
+            or getattr(coroutine, "gi_yieldfrom", None)
+            or getattr(coroutine, "ag_await", None)
+        )
+
+    return labels
+
+
+class Profiler:
+    def __init__(self, interval: float = configs.PROFILE_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.wall = Counter()
+        self.cpu = Counter()
+        self.lag = []
+        self.samples = 0
+        self.idle_samples = 0
+        self.loop = None
+        self.thread_id = None
+        self.lag_task = None
+        self.stopped = threading.Event()
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        frames = thread_stack(frame)
+
+        if not frames:
+            return
+
+        self.samples += 1
+        top = frames[-1].f_code
+        idle = (os.path.basename(top.co_filename), top.co_name) in IDLE_FUNCTIONS
+
+        if not idle:
+            stack = ";".join(frame_label(frame) for frame in frames)
+            self.cpu[stack] += 1
+            self.wall["[running];" + stack] += 1
+            return
+
+        self.idle_samples += 1
+
+        try:
+            tasks = list(asyncio.all_tasks(self.loop))
+        except RuntimeError:
+            return
+
+        for task in tasks:
+            if task is self.lag_task:
+                continue
+
+            labels = coroutine_stack(task.get_coro())
+
+            if labels:
+                self.wall[f"[waiting];{task.get_name()};" + ";".join(labels)] += 1
+
+    def _run_sampler(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                continue
+
+    async def _monitor_lag(self) -> None:
+        while True:
+            started = self.loop.time()
+            await asyncio.sleep(configs.PROFILE_LAG_INTERVAL)
+            self.lag.append(max(0.0, self.loop.time() - started - configs.PROFILE_LAG_INTERVAL))
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["Profiler"]:
+        self.loop = asyncio.get_running_loop()
+        self.thread_id = threading.get_ident()
+        sampler = threading.Thread(target=self._run_sampler, name="koyunkapan-profiler", daemon=True)
+        self.lag_task = asyncio.create_task(self._monitor_lag(), name="profiler-lag")
+        started_wall, started_cpu = time.perf_counter(), time.process_time()
+        sampler.start()
+
+        try:
+            yield self
+        finally:
+            self.wall_seconds = time.perf_counter() - started_wall
+            self.cpu_seconds = time.process_time() - started_cpu
+            self.stopped.set()
+            sampler.join()
+            self.lag_task.cancel()
+
+    def self_time(self, stacks: Counter) -> list[tuple[str, int]]:
+        functions = Counter()
+
+        for stack, count in stacks.items():
+            functions[stack.rsplit(";", 1)[-1]] += count
+
+        return functions.most_common(configs.PROFILE_TOP_FUNCTIONS)
+
+    def summary(self, target: str) -> str:
+        lag_ms = sorted(value * 1000 for value in self.lag) or [0.0]
+        lag_p95 = lag_ms[min(len(lag_ms) - 1, int(len(lag_ms) * 0.95))]
+        lines = [
+            f"Target: {target}",
+            f"Wall time: {self.wall_seconds:.2f} s",
+            f"CPU time: {self.cpu_seconds:.2f} s",
+            f"Samples: {self.samples} ({self.idle_samples} idle, interval {self.interval * 1000:.0f} ms)",
+            f"Event loop lag: p50 {statistics.median(lag_ms):.1f} ms, p95 {lag_p95:.1f} ms, max {lag_ms[-1]:.1f} ms",
+            f"Counters: {dict(metrics.counters)}",
+            "",
+            "Top CPU functions (samples):",
+            *(f"  {count:6d}  {function}" for function, count in self.self_time(self.cpu)),
+            "",
+            "Top awaited functions (samples):",
+            *(f"  {count:6d}  {function}" for function, count in self.self_time(self.wall)),
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, target: str) -> str:
+        name = f"{datetime.now():%Y%m%d-%H%M%S}-{target.replace(':', '-')}"
+        output_dir = os.path.join(configs.DATA_DIR, "profiles")
+        os.makedirs(output_dir, exist_ok=True)
+
+        for kind, stacks in (("wall", self.wall), ("cpu", self.cpu)):
+            with open(os.path.join(output_dir, f"{name}.{kind}.collapsed"), "w", encoding="utf-8") as f:
+                for stack, count in stacks.items():
+                    f.write(f"{stack} {count}\n")
+
+        summary_path = os.path.join(output_dir, f"{name}.summary.txt")
+
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(self.summary(target))
+
+        return summary_path
@@ -0,0 +1,120 @@
+import asyncio
+import zlib
+
+from tortoise.transactions import in_transaction
+
+from . import configs, database, models
+from .leases import LeaseManager
+from .logger import Logger
+
+log = Logger()
+
+
+def compress(text: str | None) -> bytes | None:
+    if text is None:
+        return None
+
+    return zlib.compress(text.encode("utf-8"), configs.RETENTION_COMPRESSION_LEVEL)
+
+
+def decompress(data: bytes | None) -> str | None:
+    if data is None:
+        return None
+
+    return zlib.decompress(data).decode("utf-8")
+
+
+async def archive_replies(
+    hot_replies: int = configs.RETENTION_HOT_REPLIES, batch_size: int = configs.RETENTION_BATCH_SIZE
+) -> int:
+    archived = 0
+
+    while True:
+        rows = (
+            await models.Reply.filter(text__isnull=False)
+            .order_by("-id")
+            .offset(hot_replies)
+            .limit(batch_size)
+            .values_list("id", "text")
+        )
+
+        if not rows:
+            break
+
+        async with in_transaction() as connection:
+            await models.ArchivedReply.bulk_create(
+                [models.ArchivedReply(id=reply_id, text=compress(text)) for reply_id, text in rows],
+                ignore_conflicts=True,
+                using_db=connection,
+            )
+            await models.Reply.filter(id__in=[reply_id for reply_id, text in rows]).using_db(connection).update(
+                text=None
+            )
+
+        archived += len(rows)
+
+        if len(rows) < batch_size:
+            break
+
+    if archived:
+        log.info("Archived the text of %s replies.", archived)
+
+    return archived
+
+
+async def prune_corpus(keep: int = configs.PLANNER_CORPUS_SIZE) -> int:
+    cutoff = await models.CorpusComment.all().order_by("-id").offset(keep).limit(1).values_list("id", flat=True)
+
+    if not cutoff:
+        return 0
+
+    pruned = await models.CorpusComment.filter(id__lte=cutoff[0]).delete()
+
+    if pruned:
+        log.info("Pruned %s old corpus comments.", pruned)
+
+    return pruned
+
+
+async def reply_texts(reply_ids: list[int]) -> dict[int, str | None]:
+    archived = await models.ArchivedReply.filter(id__in=reply_ids).values_list("id", "text")
+    return {reply_id: decompress(text) for reply_id, text in archived}
+
+
+async def fill_texts(replies: list[dict]) -> list[dict]:
+    missing = [reply["id"] for reply in replies if reply["text"] is None]
+
+    if missing:
+        texts = await reply_texts(missing)
+
+        for reply in replies:
+            if reply["text"] is None:
+                reply["text"] = texts.get(reply["id"])
+
+    return replies
+
+
+async def run(leases: LeaseManager) -> None:
+    while True:
+        try:
+            if await leases.acquire("retention", configs.RETENTION_INTERVAL):
+                await archive_replies()
+                await prune_corpus()
+        except Exception as e:
+            log.error("Failed to archive old replies: %s", e)
+
+        await asyncio.sleep(configs.RETENTION_INTERVAL)
+
+
+async def main() -> None:
+    await database.init()
+
+    try:
+        await archive_replies()
+        await prune_corpus()
+    finally:
+        await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
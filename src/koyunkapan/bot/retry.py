@@ -0,0 +1,141 @@
+import asyncio
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable
+
+from . import configs, metrics
+
+
+class RetryPolicy:
+    def __init__(self, name: str, attempts: int, base: float, cap: float, retry_server_errors: bool = True) -> None:
+        self.name = name
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.retry_server_errors = retry_server_errors
+
+    def next_delay(self, previous: float) -> float:
+        return min(self.cap, random.uniform(self.base, max(self.base, previous * 3)))
+
+
+READ = RetryPolicy("read", attempts=4, base=1, cap=60)
+SEARCH = RetryPolicy("search", attempts=3, base=2, cap=60)
+WRITE = RetryPolicy("write", attempts=3, base=5, cap=120, retry_server_errors=False)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, endpoint: str) -> None:
+        super().__init__(f"Circuit for '{endpoint}' is open.")
+        self.endpoint = endpoint
+
+
+class CircuitBreaker:
+    def __init__(self, endpoint: str, threshold: int, cooldown: float) -> None:
+        self.endpoint = endpoint
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.half_open = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+
+        if time.monotonic() - self.opened_at < self.cooldown or self.half_open:
+            return False
+
+        self.half_open = True
+        return True
+
+    def abandon_trial(self) -> None:
+        self.half_open = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.half_open = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self.half_open or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self.half_open = False
+            metrics.increment(f"circuit_opened.{self.endpoint}")
+
+
+breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    if endpoint not in breakers:
+        breakers[endpoint] = CircuitBreaker(endpoint, configs.CIRCUIT_FAILURE_THRESHOLD, configs.CIRCUIT_COOLDOWN)
+
+    return breakers[endpoint]
+
+
+def rate_limit_delay(e: Exception) -> float | None:
+    from asyncpraw.exceptions import APIException
+    from asyncprawcore.exceptions import TooManyRequests
+
+    if isinstance(e, TooManyRequests):
+        try:
+            return float(e.retry_after)
+        except (TypeError, ValueError):
+            return None
+
+    if isinstance(e, APIException) and e.error_type == "RATELIMIT":
+        match = re.search(r"(\d+)\s+(minutes?|seconds?)", e.message or "")
+
+        if match:
+            return int(match.group(1)) * (60 if match.group(2).startswith("minute") else 1)
+
+    return None
+
+
+def is_rate_limit(e: Exception) -> bool:
+    from asyncpraw.exceptions import APIException
+    from asyncprawcore.exceptions import TooManyRequests
+
+    return isinstance(e, TooManyRequests) or (isinstance(e, APIException) and e.error_type == "RATELIMIT")
+
+
+async def call(factory: Callable[[], Awaitable[Any]], policy: RetryPolicy = READ, endpoint: str = "default") -> Any:
+    from asyncprawcore.exceptions import RequestException, ServerError
+
+    breaker = get_breaker(endpoint)
+    delay = policy.base
+
+    for attempt in range(policy.attempts):
+        if not breaker.allow():
+            metrics.increment(f"short_circuits.{endpoint}")
+            raise CircuitOpenError(endpoint)
+
+        try:
+            result = await factory()
+        except (RequestException, ServerError):
+            breaker.record_failure()
+
+            if not policy.retry_server_errors or attempt == policy.attempts - 1:
+                raise
+
+            delay = policy.next_delay(delay)
+        except Exception as e:
+            breaker.record_success()
+
+            if not is_rate_limit(e) or attempt == policy.attempts - 1:
+                raise
+
+            delay = rate_limit_delay(e) or policy.next_delay(delay)
+        except BaseException:
+            breaker.abandon_trial()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+        metrics.increment(f"retries.{endpoint}")
+        metrics.increment("retry_sleep_seconds", delay)
+        await asyncio.sleep(delay)
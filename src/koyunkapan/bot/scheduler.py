@@ -0,0 +1,100 @@
+import random
+from collections import defaultdict
+
+from . import configs, models
+from .leases import LeaseManager
+
+
+class SubredditStats:
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.successes = 0
+        self.api_calls = 0
+        self.velocity = 0.0
+
+    @property
+    def cost_per_attempt(self) -> float:
+        return (self.api_calls + configs.SCHEDULER_PRIOR_API_CALLS) / (self.attempts + 1)
+
+    def sample_yield(self) -> float:
+        return random.betavariate(self.successes + 1, self.attempts - self.successes + 1)
+
+
+class Scheduler:
+    def __init__(self, persist: bool = True) -> None:
+        self.stats: dict[str, SubredditStats] = defaultdict(SubredditStats)
+        self.persist = persist
+
+    async def refresh(self) -> None:
+        runs = (
+            await models.Run.all()
+            .order_by("-id")
+            .limit(configs.SCHEDULER_HISTORY_SIZE)
+            .values("subreddit__name", "success", "api_calls", "velocity")
+        )
+        self.stats = defaultdict(SubredditStats)
+
+        for run in runs:
+            stats = self.stats[run["subreddit__name"]]
+            stats.attempts += 1
+            stats.successes += int(run["success"])
+            stats.api_calls += run["api_calls"]
+            stats.velocity += (run["velocity"] - stats.velocity) / stats.attempts
+
+    def rank(self, subreddit_names: list[str] | None = None) -> list[str]:
+        subreddit_names = subreddit_names or list(configs.SUBREDDIT_WEIGHTS.keys())
+        scores = {
+            name: configs.SUBREDDIT_WEIGHTS.get(name, 1.0)
+            * self.stats[name].sample_yield()
+            / self.stats[name].cost_per_attempt
+            for name in subreddit_names
+        }
+        return sorted(subreddit_names, key=scores.get, reverse=True)
+
+    def choose(self, subreddit_names: list[str] | None = None) -> str:
+        return self.rank(subreddit_names)[0]
+
+    async def claim(self, leases: LeaseManager) -> str | None:
+        for subreddit_name in self.rank():
+            if await leases.acquire(f"subreddit:{subreddit_name}", configs.SUBREDDIT_LEASE_TTL):
+                return subreddit_name
+
+        return None
+
+    def expected_velocity(self) -> float:
+        total_weight = sum(configs.SUBREDDIT_WEIGHTS.values())
+        return sum(
+            weight * self.stats[name].velocity / total_weight for name, weight in configs.SUBREDDIT_WEIGHTS.items()
+        )
+
+    def sleep_duration(self) -> int:
+        min_sleep_seconds, max_sleep_seconds = (
+            configs.MIN_SLEEP_MINUTES * 60,
+            configs.MAX_SLEEP_MINUTES * 60,
+        )
+        velocity = self.expected_velocity()
+
+        if velocity <= 0:
+            return random.randint(min_sleep_seconds, max_sleep_seconds)
+
+        sleep_duration = configs.SCHEDULER_FRESH_POSTS / velocity * 3600
+        sleep_duration *= random.uniform(0.9, 1.1)
+        return int(min(max(sleep_duration, min_sleep_seconds), max_sleep_seconds))
+
+    async def record(
+        self, subreddit_obj: models.Subreddit, success: bool, api_calls: int, candidates: int, velocity: float
+    ) -> None:
+        if self.persist:
+            await models.Run.create(
+                subreddit=subreddit_obj,
+                success=success,
+                api_calls=api_calls,
+                candidates=candidates,
+                velocity=velocity,
+            )
+
+        stats = self.stats[subreddit_obj.name]
+        stats.attempts += 1
+        stats.successes += int(success)
+        stats.api_calls += api_calls
+        stats.velocity += (velocity - stats.velocity) / stats.attempts
@@ -1,34 +1,15 @@
-import asyncio
-import itertools
-import re
 from functools import wraps
+from typing import Any, Awaitable, Callable
 
-import numpy as np
-from asyncpraw.exceptions import APIException
-from asyncprawcore.exceptions import RequestException, ServerError, TooManyRequests
-
+from . import retry
 from .logger import Logger
 
 log = Logger()
 
 
-def get_keyword_combinations(keywords: list[str]) -> list[str]:
-    if not keywords:
-        return []
-
-    keywords = keywords[:5]
-    all_combinations = []
-
-    for i in range(1, min(len(keywords) + 1, 4)):
-        all_combinations.extend(itertools.combinations(keywords, i))
-
-    output_queries = [" AND ".join(f'"{k}"' for k in combo) for combo in all_combinations]
-    output_queries.sort(key=len, reverse=True)
-
-    return output_queries
-
-
 def calculate_sentence_difference(s1: str | list[str], s2: str | list[str]) -> float:
+    import numpy as np
+
     words1 = s1.split() if isinstance(s1, str) else s1
     words2 = s2.split() if isinstance(s2, str) else s2
 
@@ -73,90 +54,45 @@ def calculate_sentence_difference(s1: str | list[str], s2: str | list[str]) -> f
     return total_result + abs(len(s1) - len(s2))
 
 
-async def robust_praw_call(awaitable, retries=3, initial_sleep=5):
-    last_exception = None
-    for attempt in range(retries):
-        try:
-            return await awaitable
-        except (APIException, TooManyRequests) as e:
-            if (isinstance(e, APIException) and e.error_type == "RATELIMIT") or isinstance(e, TooManyRequests):
-                message = e.message if isinstance(e, APIException) else str(e)
-                log.warning(f"Rate limit exceeded: {message}. Retrying...")
-                try:
-                    sleep_time_str = re.search(r"(\d+)\s+(minutes|seconds)", message)
-                    if sleep_time_str:
-                        sleep_time = int(sleep_time_str.group(1))
-                        if sleep_time_str.group(2) == "minutes":
-                            sleep_time *= 60
-                        log.info(f"Sleeping for {sleep_time} seconds due to rate limit.")
-                        await asyncio.sleep(sleep_time)
-                    else:
-                        await asyncio.sleep(initial_sleep * (2**attempt))
-                except (AttributeError, IndexError):
-                    await asyncio.sleep(initial_sleep * (2**attempt))
-            else:
-                log.error(f"API Exception for {awaitable}: {e}")
-                return None
-        except (RequestException, ServerError) as e:
-            last_exception = e
-            log.warning(f"Request/Server Exception for {awaitable}: {e}. Retrying...")
-            await asyncio.sleep(initial_sleep * (2**attempt))
-        except Exception as e:
-            log.error(f"An unexpected error of type {type(e).__name__} occurred for {awaitable}: {e}")
-            return None
-    log.error(f"PRAW call failed for {awaitable} after {retries} retries.")
-    if last_exception:
-        log.error(f"Last exception: {last_exception}")
+async def robust_praw_call(
+    factory: Callable[[], Awaitable[Any]], policy: retry.RetryPolicy | None = None, endpoint: str = "load"
+) -> Any | None:
+    from asyncpraw.exceptions import APIException
+    from asyncprawcore.exceptions import RequestException, ServerError, TooManyRequests
+
+    try:
+        if policy is None:
+            return await factory()
+
+        return await retry.call(factory, policy=policy, endpoint=endpoint)
+    except retry.CircuitOpenError as e:
+        log.warning("%s Skipping call.", e)
+    except (APIException, TooManyRequests, RequestException, ServerError) as e:
+        log.error("PRAW call to '%s' failed: %s", endpoint, e)
+    except Exception as e:
+        log.error("An unexpected error of type %s occurred calling '%s': %s", type(e).__name__, endpoint, e)
+
     return None
 
 
-def handle_api_exceptions(retries=3, backoff_factor=1):
+def handle_api_exceptions(policy: retry.RetryPolicy | None = None, endpoint: str | None = None):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            last_exception = None
-
-            for attempt in range(retries):
-                try:
-                    return await func(*args, **kwargs)
-                except (APIException, TooManyRequests) as e:
-                    if (isinstance(e, APIException) and e.error_type == "RATELIMIT") or isinstance(e, TooManyRequests):
-                        message = e.message if isinstance(e, APIException) else str(e)
-                        log.warning(f"Rate limit exceeded: {message}. Retrying...")
-
-                        try:
-                            sleep_time_str = re.search(r"(\d+)\s+(minutes|seconds)", message)
-
-                            if sleep_time_str:
-                                sleep_time = int(sleep_time_str.group(1))
-
-                                if sleep_time_str.group(2) == "minutes":
-                                    sleep_time *= 60
-
-                                log.info(f"Sleeping for {sleep_time} seconds due to rate limit.")
-                                await asyncio.sleep(sleep_time)
-                            else:
-                                await asyncio.sleep(5 * (2**attempt))
-                        except (AttributeError, IndexError):
-                            await asyncio.sleep(5 * (2**attempt))
-                    else:
-                        log.error(f"API Exception in {func.__name__}: {e}")
-                        return None
-                except (RequestException, ServerError) as e:
-                    last_exception = e
-                    log.warning(
-                        f"Request/Server Exception in {func.__name__}: {e}. Retrying in {backoff_factor * (2**attempt)} seconds..."
-                    )
-                    await asyncio.sleep(backoff_factor * (2**attempt))
-
-                except Exception as e:
-                    log.error(f"An unexpected error of type {type(e).__name__} occurred in {func.__name__}: {e}")
-                    return None
-
-            log.error(f"Function {func.__name__} failed after {retries} retries.")
-
-            if last_exception:
-                log.error(f"Last exception: {last_exception}")
+            from asyncpraw.exceptions import APIException
+            from asyncprawcore.exceptions import RequestException, ServerError, TooManyRequests
+
+            if policy is not None:
+                return await robust_praw_call(lambda: func(*args, **kwargs), policy, endpoint or func.__name__)
+
+            try:
+                return await func(*args, **kwargs)
+            except retry.CircuitOpenError as e:
+                log.warning("%s Skipping %s.", e, func.__name__)
+            except (APIException, TooManyRequests, RequestException, ServerError) as e:
+                log.error("API Exception in %s: %s", func.__name__, e)
+            except Exception as e:
+                log.error("An unexpected error of type %s occurred in %s: %s", type(e).__name__, func.__name__, e)
 
             return None
 
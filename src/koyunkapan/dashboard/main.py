@@ -2,7 +2,9 @@ import asyncio
 import atexit
 import logging
 import secrets
+import threading
 from datetime import UTC, datetime
+from functools import wraps
 
 import flask
 
@@ -12,25 +14,62 @@ from koyunkapan.bot import database
 log = logging.getLogger("werkzeug")
 log.setLevel(logging.ERROR)
 
-app = flask.Flask(__name__)
-app.secret_key = secrets.token_hex(24)
 
+class Dashboard(flask.Flask):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.loop = None
+        self.loop_thread = None
+        self.loop_lock = threading.Lock()
+        self.ready = threading.Event()
 
-@app.before_request
-async def init_db() -> None:
-    await database.init()
+    def start(self) -> None:
+        with self.loop_lock:
+            if self.ready.is_set():
+                return
 
+            self.loop = asyncio.new_event_loop()
+            self.loop_thread = threading.Thread(target=self.loop.run_forever, name="dashboard-loop", daemon=True)
+            self.loop_thread.start()
+            asyncio.run_coroutine_threadsafe(database.init(), self.loop).result()
+            self.ready.set()
 
-def close_db() -> None:
-    asyncio.run(database.close())
+    def stop(self) -> None:
+        with self.loop_lock:
+            if not self.ready.is_set():
+                return
 
+            self.ready.clear()
+            asyncio.run_coroutine_threadsafe(database.close(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join()
+            self.loop.close()
+            self.loop = None
 
-atexit.register(close_db)
+    def run_coroutine(self, coroutine):
+        if not self.ready.is_set():
+            self.start()
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def async_to_sync(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run_coroutine(func(*args, **kwargs))
+
+        return wrapper
 
 
-@app.route("/healthcheck")
 async def healthcheck() -> flask.Response:
     return flask.jsonify(status="healthy", version=__version__, timestamp=datetime.now(UTC))
 
 
-from . import views
+def create_app() -> Dashboard:
+    from . import views
+
+    app = Dashboard(__name__)
+    app.secret_key = secrets.token_hex(24)
+    app.add_url_rule("/healthcheck", view_func=healthcheck)
+    views.init_app(app)
+    atexit.register(app.stop)
+    return app
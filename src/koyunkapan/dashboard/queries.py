@@ -0,0 +1,38 @@
+from tortoise.functions import Count
+
+from koyunkapan.bot import models, retention
+
+
+async def recent_replies(limit: int) -> list[dict]:
+    replies = (
+        await models.Reply.all()
+        .order_by("-id")
+        .limit(limit)
+        .values("id", "text", "submission_id", "comment_id", "subreddit__name")
+    )
+    return await retention.fill_texts(replies[::-1])
+
+
+async def total_replies() -> int:
+    return await models.Reply.all().count()
+
+
+async def popular_references(limit: int) -> list[dict]:
+    return (
+        await models.Reply.all()
+        .group_by("reference_submission_id")
+        .annotate(count=Count("id"))
+        .order_by("-count")
+        .limit(limit)
+        .values("reference_submission_id", "count")
+    )
+
+
+async def subreddit_activity() -> list[dict]:
+    return (
+        await models.Reply.all()
+        .group_by("subreddit__name")
+        .annotate(count=Count("id"))
+        .order_by("-count")
+        .values("subreddit__name", "count")
+    )
@@ -0,0 +1,81 @@
+import hashlib
+import os
+from collections import OrderedDict
+from functools import wraps
+from typing import Awaitable, Callable
+
+import flask
+from flask.typing import ResponseReturnValue
+
+from koyunkapan import __version__
+from koyunkapan.bot import configs, models
+
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+RESPONSE_CACHE_SIZE = 32
+
+
+class ResponseCache:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.responses: OrderedDict[tuple[str, str], tuple[bytes, str]] = OrderedDict()
+
+    def get(self, key: tuple[str, str]) -> tuple[bytes, str] | None:
+        entry = self.responses.get(key)
+
+        if entry is not None:
+            self.responses.move_to_end(key)
+
+        return entry
+
+    def put(self, key: tuple[str, str], body: bytes, mimetype: str) -> None:
+        self.responses[key] = (body, mimetype)
+        self.responses.move_to_end(key)
+
+        while len(self.responses) > self.maxsize:
+            self.responses.popitem(last=False)
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+
+
+async def reply_version() -> str:
+    last_ids = await models.Reply.all().order_by("-id").limit(1).values_list("id", flat=True)
+    last_id = last_ids[0] if last_ids else 0
+    return hashlib.sha1(f"{__version__}:{last_id}".encode()).hexdigest()
+
+
+async def dashboard_version() -> str:
+    try:
+        stat = os.stat(configs.LOG_FILE)
+        log_mtime, log_size = stat.st_mtime, stat.st_size
+    except FileNotFoundError:
+        log_mtime, log_size = 0.0, 0
+
+    key = f"{await reply_version()}:{log_mtime}:{log_size}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def conditional(version: Callable[[], Awaitable[str]]):
+    def decorator(view: Callable[..., Awaitable[ResponseReturnValue]]):
+        @wraps(view)
+        async def wrapper(*args, **kwargs) -> flask.Response:
+            etag = await version()
+            key = (flask.request.full_path, etag)
+            cached = response_cache.get(key)
+
+            if flask.request.if_none_match.contains(etag):
+                response = flask.Response(status=304)
+            elif cached is not None:
+                body, mimetype = cached
+                response = flask.Response(body, mimetype=mimetype)
+            else:
+                response = flask.make_response(await view(*args, **kwargs))
+                response_cache.put(key, response.get_data(), response.mimetype)
+
+            response.set_etag(etag)
+            response.cache_control.no_cache = True
+            return response.make_conditional(flask.request)
+
+        return wrapper
+
+    return decorator
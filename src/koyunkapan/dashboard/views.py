@@ -3,35 +3,18 @@ from typing import Union
 
 import flask
 import werkzeug
-from tortoise.functions import Count
 
-from koyunkapan.bot import configs, models
+from koyunkapan import __version__
+from koyunkapan.bot import configs
 
-from . import main
+from . import queries, utils
 
 
-@main.app.route("/")
+@utils.conditional(utils.dashboard_version)
 async def index() -> Union[str, werkzeug.wrappers.Response]:
-    replies = await models.Reply.all().values("text", "submission_id", "comment_id", "subreddit__name")
-
-    subreddit_activity = (
-        await models.Reply.all()
-        .group_by("subreddit__name")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-        .values("subreddit__name", "count")
-    )
-    chart_labels = [item["subreddit__name"] for item in subreddit_activity]
-    chart_data = [item["count"] for item in subreddit_activity]
-
-    popular_references = (
-        await models.Reply.all()
-        .group_by("reference_submission_id")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-        .limit(10)
-        .values("reference_submission_id", "count")
-    )
+    replies = await queries.recent_replies(15)
+    total_replies = await queries.total_replies()
+    popular_references = await queries.popular_references(10)
 
     try:
         with open(configs.LOG_FILE, "r", encoding="utf-8") as f:
@@ -43,10 +26,29 @@ async def index() -> Union[str, werkzeug.wrappers.Response]:
 
     return flask.render_template(
         "index.html",
-        replies=replies[-15:],
-        total_replies=len(replies),
+        replies=replies,
+        total_replies=total_replies,
         logs=logs[-100:],
-        chart_labels=chart_labels,
-        chart_data=chart_data,
         popular_references=popular_references,
     )
+
+
+@utils.conditional(utils.reply_version)
+async def chart() -> werkzeug.wrappers.Response:
+    subreddit_activity = await queries.subreddit_activity()
+
+    return flask.jsonify(
+        labels=[item["subreddit__name"] for item in subreddit_activity],
+        data=[item["count"] for item in subreddit_activity],
+    )
+
+
+def inject_version() -> dict[str, str]:
+    return {"version": __version__}
+
+
+def init_app(app: flask.Flask) -> None:
+    app.config["SEND_FILE_MAX_AGE_DEFAULT"] = utils.STATIC_MAX_AGE
+    app.context_processor(inject_version)
+    app.add_url_rule("/", view_func=index)
+    app.add_url_rule("/api/chart", view_func=chart)
@@ -1,4 +1,4 @@
 #!/bin/bash
 
 python3 -m koyunkapan.bot.core &
-flask --app koyunkapan.dashboard.main:app run --host=0.0.0.0 --debug
+uvicorn koyunkapan.dashboard.asgi:app --host 0.0.0.0 --port 5000 --workers ${DASHBOARD_WORKERS:-2}
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from koyunkapan.bot.cache import SingleFlight
+
+
+class SingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_concurrent_loads(self):
+        flight = SingleFlight(maxsize=8, ttl=60)
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(await flight.do("key", load), "value")
+        self.assertEqual(len(calls), 1)
+
+    async def test_waiters_reissue_load_when_owner_is_cancelled(self):
+        flight = SingleFlight(maxsize=8, ttl=60)
+        started = asyncio.Event()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        owner = asyncio.create_task(flight.do("key", load))
+        await started.wait()
+        waiter = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await owner
+
+        self.assertEqual(await waiter, 2)
+
+    async def test_cancelled_waiter_does_not_cancel_owner(self):
+        flight = SingleFlight(maxsize=8, ttl=60)
+        started = asyncio.Event()
+
+        async def load():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "value"
+
+        owner = asyncio.create_task(flight.do("key", load))
+        await started.wait()
+        waiter = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        self.assertEqual(await owner, "value")
+
+    async def test_errors_are_shared_and_not_cached(self):
+        flight = SingleFlight(maxsize=8, ttl=60)
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertIsNone(flight.get("key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from koyunkapan.dashboard.asgi import create_asgi_app
+from koyunkapan.dashboard.main import create_app
+
+
+class ConditionalResponseTests(unittest.TestCase):
+    def setUp(self):
+        data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"KOYUNKAPAN_DATA_DIR": data_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("KOYUNKAPAN_DB_URL", None)
+        self.log_file = os.path.join(data_dir.name, "app.log")
+        self.append_log("started")
+        self.app = create_app()
+        self.addCleanup(self.app.stop)
+        self.client = self.app.test_client()
+
+    def append_log(self, line: str) -> None:
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def test_chart_stays_cached_while_the_log_grows(self):
+        first = self.client.get("/api/chart")
+        self.append_log("another line")
+        second = self.client.get("/api/chart", headers={"If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 304)
+
+    def test_index_changes_with_the_log(self):
+        first = self.client.get("/")
+        self.append_log("another line")
+        second = self.client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(second.status_code, 200)
+
+    def test_does_not_send_last_modified(self):
+        response = self.client.get("/")
+
+        self.assertNotIn("Last-Modified", response.headers)
+
+
+class AsgiTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"KOYUNKAPAN_DATA_DIR": data_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("KOYUNKAPAN_DB_URL", None)
+
+    async def test_serves_requests_through_the_wsgi_bridge(self):
+        app = create_asgi_app()
+        self.addCleanup(app.dashboard.stop)
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/healthcheck", "query_string": b"", "http_version": "1.1"}
+        await app(scope, receive, send)
+
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertIn(b"healthy", b"".join(message.get("body", b"") for message in messages[1:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
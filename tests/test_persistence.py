@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from koyunkapan.bot import database, models
+from koyunkapan.bot.persistence import WriteBehind
+
+
+def reply_row(comment_id: str, **overrides) -> dict:
+    row = {
+        "text": "selam",
+        "submission_id": "s1",
+        "comment_id": comment_id,
+        "reference_submission_id": "r1",
+        "reference_comment_id": "rc1",
+        "reference_author": "koyun",
+        "subreddit": "KGBTR",
+    }
+    row.update(overrides)
+    return row
+
+
+class WriteBehindTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.data_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"KOYUNKAPAN_DATA_DIR": self.data_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        log_patcher = mock.patch("koyunkapan.bot.persistence.log")
+        log_patcher.start()
+        self.addCleanup(log_patcher.stop)
+        os.environ.pop("KOYUNKAPAN_DB_URL", None)
+        await database.init()
+
+    async def asyncTearDown(self):
+        await database.close()
+
+    async def test_replays_rows_left_by_a_crashed_worker(self):
+        crashed = WriteBehind("w1")
+        await crashed.add("Reply", [reply_row("c1"), reply_row("c2")])
+        crashed.journal.close()
+
+        writer = WriteBehind("w1")
+
+        self.assertEqual(writer.replay(), 2)
+        self.assertEqual(await writer.flush(), 2)
+        self.assertEqual(await models.Reply.all().count(), 2)
+        self.assertEqual(os.path.getsize(writer.path), 0)
+        await writer.close()
+
+    async def test_skips_replies_that_are_already_stored(self):
+        writer = WriteBehind("w1")
+        await writer.add("Reply", [reply_row("c1")])
+        await writer.flush()
+        await writer.add("Reply", [reply_row("c1"), reply_row("c2"), reply_row("c2")])
+        await writer.flush()
+
+        self.assertEqual(
+            sorted(await models.Reply.all().values_list("comment_id", flat=True)),
+            ["c1", "c2"],
+        )
+        await writer.close()
+
+    async def test_moves_a_poison_row_to_the_dead_letter_file(self):
+        writer = WriteBehind("w1")
+        await writer.add("Reply", [reply_row("c1"), reply_row("c2", reference_author=None), reply_row("c3")])
+
+        self.assertEqual(await writer.flush(), 2)
+        self.assertEqual(writer.pending, [])
+        self.assertEqual(
+            sorted(await models.Reply.all().values_list("comment_id", flat=True)),
+            ["c1", "c3"],
+        )
+
+        with open(writer.dead_letter_path, encoding="utf-8") as f:
+            dead = [json.loads(line) for line in f]
+
+        self.assertEqual([entry["row"]["comment_id"] for entry in dead], ["c2"])
+        self.assertIn("error", dead[0])
+        await writer.close()
+
+    async def test_keeps_rows_when_the_database_is_unreachable(self):
+        writer = WriteBehind("w1")
+        await writer.add("Reply", [reply_row("c1")])
+
+        with mock.patch.object(writer, "_write", mock.AsyncMock(side_effect=ConnectionError("down"))):
+            self.assertEqual(await writer.flush(), 0)
+
+        self.assertEqual(len(writer.pending), 1)
+        self.assertFalse(os.path.exists(writer.dead_letter_path))
+        self.assertEqual(await writer.flush(), 1)
+        await writer.close()
+
+    async def test_refuses_a_journal_locked_by_another_worker(self):
+        first, second = WriteBehind("w1"), WriteBehind("w1")
+        first.acquire()
+
+        with self.assertRaises(RuntimeError):
+            second.acquire()
+
+        await first.close()
+        second.acquire()
+        await second.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
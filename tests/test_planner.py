@@ -0,0 +1,82 @@
+import unittest
+
+from koyunkapan.bot import configs, planner
+
+
+def build_corpus() -> planner.Corpus:
+    documents = [f"istanbul ışık haber {i}" for i in range(1500)]
+    documents += [f"istanbul trafik {i}" for i in range(1500)]
+    documents += ["durum fena", "bugün durum iyi"]
+    return planner.Corpus(documents)
+
+
+class NormalizeTests(unittest.TestCase):
+    def test_lowercases_turkish_letters(self):
+        self.assertEqual(planner.normalize("IŞIK İstanbul"), ["ışık", "istanbul"])
+
+    def test_strips_punctuation_digits_and_stop_words(self):
+        self.assertEqual(planner.normalize("Bu ışık, 2024'te yine mi yanmıyor?!"), ["ışık", "te", "yanmıyor"])
+
+    def test_drops_single_characters(self):
+        self.assertEqual(planner.normalize("a b c kedi"), ["kedi"])
+
+
+class PlanQueriesTests(unittest.TestCase):
+    def test_keeps_rare_and_unseen_keywords(self):
+        plan = planner.plan_queries("İstanbul'da ışık yanmıyor, durum ne?", build_corpus())
+        planned_keywords = {keyword for planned in plan for keyword in planned.keywords}
+
+        self.assertIn("yanmıyor", planned_keywords)
+        self.assertIn("durum", planned_keywords)
+
+    def test_ranks_most_selective_queries_first(self):
+        corpus = build_corpus()
+        plan = planner.plan_queries("istanbul ışık yanmıyor", corpus)
+
+        self.assertIn("yanmıyor", plan[0].keywords)
+        self.assertEqual(planner.rank_keywords("istanbul yanmıyor", corpus), ["yanmıyor", "istanbul"])
+
+    def test_skips_combinations_with_trivial_yield(self):
+        plan = planner.plan_queries("İstanbul'da ışık yanmıyor, durum ne?", build_corpus())
+
+        for planned in plan:
+            if len(planned.keywords) > 1:
+                self.assertGreaterEqual(planned.expected_hits, configs.PLANNER_MIN_EXPECTED_HITS)
+
+    def test_realistic_corpus_reaches_the_threshold(self):
+        documents = [f"genel konu {i}" for i in range(5000)]
+
+        for i, word in enumerate(["kedi"] * 150 + ["mama"] * 40 + ["fiyatları"] * 50 + ["pahalı"] * 80):
+            documents[i * 7 % 5000] += f" {word}"
+
+        plan = planner.plan_queries("kedi mama fiyatları çok pahalı oldu", planner.Corpus(documents))
+
+        self.assertGreaterEqual(sum(planned.expected_hits for planned in plan), configs.MIN_SUBMISSION_THRESHOLD)
+        self.assertLess(len(plan), configs.PLANNER_MAX_QUERIES)
+        self.assertTrue(all(len(planned.keywords) == 1 for planned in plan))
+
+    def test_caps_plan_size(self):
+        plan = planner.plan_queries("kedi köpek kuş balık tavşan hamster", planner.Corpus())
+
+        self.assertLessEqual(len(plan), configs.PLANNER_MAX_QUERIES)
+        self.assertEqual(len({planned.query for planned in plan}), len(plan))
+
+    def test_stops_once_expected_hits_are_enough(self):
+        corpus = planner.Corpus(["kedi köpek kuş"] * 100)
+        plan = planner.plan_queries("kedi köpek kuş", corpus)
+
+        self.assertGreaterEqual(sum(planned.expected_hits for planned in plan), configs.MIN_SUBMISSION_THRESHOLD)
+        self.assertLess(len(plan), configs.PLANNER_MAX_QUERIES)
+
+    def test_falls_back_to_raw_tokens(self):
+        plan = planner.plan_queries("Bu ne ya", planner.Corpus())
+
+        self.assertTrue(plan)
+        self.assertEqual({keyword for planned in plan for keyword in planned.keywords}, {"bu", "ne", "ya"})
+
+    def test_empty_text_has_no_plan(self):
+        self.assertEqual(planner.plan_queries("?! ...", planner.Corpus()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
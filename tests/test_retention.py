@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from koyunkapan.bot import database, models, retention
+
+
+class RetentionTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"KOYUNKAPAN_DATA_DIR": data_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        log_patcher = mock.patch("koyunkapan.bot.retention.log")
+        log_patcher.start()
+        self.addCleanup(log_patcher.stop)
+        os.environ.pop("KOYUNKAPAN_DB_URL", None)
+        await database.init()
+
+    async def asyncTearDown(self):
+        await database.close()
+
+    async def test_prune_corpus_keeps_the_newest_comments(self):
+        await models.CorpusComment.bulk_create(
+            [models.CorpusComment(comment_id=f"c{i}", submission_id="s1", body="kedi") for i in range(10)]
+        )
+
+        self.assertEqual(await retention.prune_corpus(keep=3), 7)
+        self.assertEqual(
+            await models.CorpusComment.all().order_by("id").values_list("comment_id", flat=True),
+            ["c7", "c8", "c9"],
+        )
+        self.assertEqual(await retention.prune_corpus(keep=3), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from asyncprawcore.exceptions import ServerError, TooManyRequests
+
+from koyunkapan.bot import retry
+
+
+def server_error() -> ServerError:
+    return ServerError(SimpleNamespace(status=503))
+
+
+def too_many_requests(retry_after: str | None) -> TooManyRequests:
+    headers = {"retry-after": retry_after} if retry_after else {}
+    return TooManyRequests(SimpleNamespace(status=429, headers=headers, text=""))
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def test_next_delay_stays_within_base_and_cap(self):
+        policy = retry.RetryPolicy("test", attempts=5, base=1, cap=10)
+        delay = policy.base
+
+        for _ in range(100):
+            delay = policy.next_delay(delay)
+            self.assertGreaterEqual(delay, policy.base)
+            self.assertLessEqual(delay, policy.cap)
+
+    def test_next_delay_grows_at_most_threefold(self):
+        policy = retry.RetryPolicy("test", attempts=5, base=1, cap=1000)
+
+        for _ in range(100):
+            self.assertLessEqual(policy.next_delay(4), 12)
+
+    def test_rate_limit_delay(self):
+        self.assertEqual(retry.rate_limit_delay(too_many_requests("7")), 7.0)
+        self.assertIsNone(retry.rate_limit_delay(too_many_requests(None)))
+        self.assertIsNone(retry.rate_limit_delay(ValueError()))
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(retry.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = retry.CircuitBreaker("test", threshold=2, cooldown=60)
+
+    def open_breaker(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+
+    def test_allows_a_single_trial_after_cooldown(self):
+        self.open_breaker()
+        self.now += 61
+
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_trial_closes(self):
+        self.open_breaker()
+        self.now += 61
+        self.breaker.allow()
+        self.breaker.record_success()
+
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        self.open_breaker()
+        self.now += 61
+        self.breaker.allow()
+        self.breaker.record_failure()
+
+        self.assertFalse(self.breaker.allow())
+        self.now += 61
+        self.assertTrue(self.breaker.allow())
+
+    def test_abandoned_trial_allows_another(self):
+        self.open_breaker()
+        self.now += 61
+        self.breaker.allow()
+        self.breaker.abandon_trial()
+
+        self.assertTrue(self.breaker.allow())
+
+
+class CallTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        retry.breakers.clear()
+        self.addCleanup(retry.breakers.clear)
+        patcher = mock.patch.object(retry.asyncio, "sleep", mock.AsyncMock())
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_retries_server_errors_then_succeeds(self):
+        factory = mock.AsyncMock(side_effect=[server_error(), server_error(), "ok"])
+
+        self.assertEqual(await retry.call(factory, retry.READ, "test"), "ok")
+        self.assertEqual(factory.await_count, 3)
+        self.assertEqual(self.sleep.await_count, 2)
+
+    async def test_write_policy_does_not_retry_server_errors(self):
+        factory = mock.AsyncMock(side_effect=server_error())
+
+        with self.assertRaises(ServerError):
+            await retry.call(factory, retry.WRITE, "test")
+
+        self.assertEqual(factory.await_count, 1)
+
+    async def test_honours_retry_after(self):
+        factory = mock.AsyncMock(side_effect=[too_many_requests("42"), "ok"])
+
+        self.assertEqual(await retry.call(factory, retry.WRITE, "test"), "ok")
+        self.sleep.assert_awaited_once_with(42.0)
+
+    async def test_other_errors_are_not_retried(self):
+        factory = mock.AsyncMock(side_effect=ValueError("boom"))
+
+        with self.assertRaises(ValueError):
+            await retry.call(factory, retry.READ, "test")
+
+        self.assertEqual(factory.await_count, 1)
+
+    async def test_open_circuit_short_circuits(self):
+        breaker = retry.get_breaker("test")
+
+        for _ in range(breaker.threshold):
+            breaker.record_failure()
+
+        factory = mock.AsyncMock()
+
+        with self.assertRaises(retry.CircuitOpenError):
+            await retry.call(factory, retry.READ, "test")
+
+        factory.assert_not_awaited()
+
+    async def test_cancelled_trial_does_not_wedge_the_breaker(self):
+        breaker = retry.get_breaker("test")
+
+        for _ in range(breaker.threshold):
+            breaker.record_failure()
+
+        breaker.opened_at -= breaker.cooldown + 1
+        factory = mock.AsyncMock(side_effect=asyncio.CancelledError())
+
+        with self.assertRaises(asyncio.CancelledError):
+            await retry.call(factory, retry.READ, "test")
+
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()